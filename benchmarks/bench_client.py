@@ -0,0 +1,134 @@
+"""
+CSDNClient 基准测试
+启动本地替身服务器，测量各客户端方法在不同并发下的延迟分位数和吞吐量
+
+用法：
+    python -m benchmarks.bench_client --concurrency 1 4 16 --calls 50 --latency 0.05
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+from loguru import logger
+from src.csdn_api.client import CSDNClient
+from src.csdn_api.logs import configure_logging
+from src.csdn_api.utils import AsyncRateLimiter
+from benchmarks.stand_in_server import StandInServer
+
+# 各方法的调用参数
+METHOD_CALLS = {
+    'get_user_info': lambda client, i: client.get_user_info(),
+    'get_unread_message_count': lambda client, i: client.get_unread_message_count(),
+    'get_article_list': lambda client, i: client.get_article_list(page=i % 10 + 1, size=20),
+    'search': lambda client, i: client.search(keyword=f'bench{i % 10}', page=1),
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """计算分位数（最近秩法）"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_level(client: CSDNClient, method: str, concurrency: int, calls: int) -> Dict:
+    """以指定并发执行一组调用"""
+    call = METHOD_CALLS[method]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(client, i)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"{method} 调用失败: {str(e)}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(calls)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        'method': method,
+        'concurrency': concurrency,
+        'calls': calls,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'calls_per_second': len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+async def run_benchmark(args) -> List[Dict]:
+    """运行全部方法和并发级别"""
+    results = []
+    with StandInServer(latency=args.latency, items=args.items, padding=args.padding) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        client = CSDNClient(
+            cookies_file=str(Path(workdir) / 'cookies.json'),
+            pool_size=max(args.concurrency),
+            use_http=args.transport == 'http',
+            url_map=server.url_map(),
+            # 基准测试只关心客户端自身开销，不限流
+            rate_limiter=AsyncRateLimiter(
+                rates={host: 1e9 for host in AsyncRateLimiter.DEFAULT_RATES}, default_rate=1e9),
+        )
+        try:
+            for method in args.methods:
+                # 预热：启动浏览器、建立连接并缓存用户ID
+                await METHOD_CALLS[method](client, 0)
+                for concurrency in args.concurrency:
+                    result = await run_level(client, method, concurrency, args.calls)
+                    results.append(result)
+                    print(f"{method:<26} c={concurrency:<4} "
+                          f"p50={result['p50_ms']:8.1f}ms p95={result['p95_ms']:8.1f}ms "
+                          f"p99={result['p99_ms']:8.1f}ms {result['calls_per_second']:8.1f} calls/s "
+                          f"errors={result['errors']}")
+        finally:
+            await client.close()
+        if args.metrics:
+            print(client.metrics.to_prometheus(), end='')
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="CSDNClient 基准测试")
+    parser.add_argument('--methods', nargs='+', default=list(METHOD_CALLS), choices=list(METHOD_CALLS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16], help="并发级别")
+    parser.add_argument('--calls', type=int, default=50, help="每个并发级别的调用次数")
+    parser.add_argument('--latency', type=float, default=0.05, help="替身接口响应延迟（秒）")
+    parser.add_argument('--items', type=int, default=20, help="每页记录数")
+    parser.add_argument('--padding', type=int, default=200, help="每条记录描述字段的长度")
+    parser.add_argument('--transport', choices=['http', 'browser'], default='http',
+                        help="article_list和search使用的传输方式")
+    parser.add_argument('--json', help="把结果写入JSON文件，便于比较回归")
+    parser.add_argument('--metrics', action='store_true', help="结束后输出各阶段耗时指标（Prometheus文本格式）")
+    args = parser.parse_args()
+
+    configure_logging(default_level="WARNING")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = loop.run_until_complete(run_benchmark(args))
+    loop.close()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
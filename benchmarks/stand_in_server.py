@@ -0,0 +1,200 @@
+"""
+CSDN 本地替身服务器
+提供与CSDN页面行为一致的HTML页面和接口，用于在不访问线上CSDN的情况下测量客户端性能
+
+所有CSDN主机都映射到同一个服务器的不同路径前缀下，
+配合 CSDNClient 的 url_map 参数使用（见 :meth:`StandInServer.url_map`）。
+"""
+
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 主机与路径前缀的对应关系
+HOST_PREFIXES = {
+    'https://i.csdn.net': '/i',
+    'https://bizapi.csdn.net': '/bizapi',
+    'https://msg.csdn.net': '/msg',
+    'https://blog.csdn.net': '/blog',
+    'https://so.csdn.net': '/so',
+}
+
+USER_ID = 'bench_user'
+
+# 个人中心页面：根据hash路由请求对应接口，与 i.csdn.net 的单页应用行为一致
+USER_CENTER_PAGE = '''<!DOCTYPE html>
+<html><head><title>个人中心</title></head>
+<body>
+<img src="/i/static/avatar.png">
+<script>
+  if (location.hash.indexOf('#/msg') === 0) {
+    fetch('/msg/v1/web/message/view/unread', {credentials: 'include'});
+  } else {
+    fetch('/bizapi/community-personal/v1/get-personal-info', {credentials: 'include'});
+  }
+</script>
+</body></html>'''
+
+# 搜索页面：加载后请求搜索接口
+SEARCH_PAGE = '''<!DOCTYPE html>
+<html><head><title>搜索</title></head>
+<body>
+<img src="/so/static/logo.png">
+<script>fetch('/so/api/v3/search' + location.search, {credentials: 'include'});</script>
+</body></html>'''
+
+# 博客主页：客户端在页面中自行发起文章列表请求
+BLOG_PAGE = '''<!DOCTYPE html>
+<html><head><title>博客</title></head>
+<body><img src="/blog/static/banner.png"></body></html>'''
+
+
+class StandInServer:
+    """CSDN 替身服务器
+
+    接口响应延迟和负载大小可配置，页面和静态资源立即返回。
+    服务器在后台线程中运行，每个请求一个线程，因此延迟不会相互阻塞。
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.05, items: int = 20, padding: int = 200):
+        """初始化替身服务器
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示随机分配
+            latency: 接口响应延迟（秒）
+            items: 文章列表和搜索结果每页的条数
+            padding: 每条记录描述字段的长度
+        """
+        self.latency = latency
+        self.items = items
+        self.padding = padding
+        self.request_count = 0
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url_map(self):
+        """供 CSDNClient 使用的地址映射"""
+        return {origin: self.base_url + prefix for origin, prefix in HOST_PREFIXES.items()}
+
+    def start(self):
+        """在后台线程中启动服务器"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def user_info(self) -> dict:
+        return {
+            'code': 200,
+            'msg': 'success',
+            'data': {
+                'general': {'avatar': '', 'codeAge': 2363, 'codeAgeModule': {'desc': '码龄6年'}},
+                'basic': {'id': USER_ID, 'nickname': '基准测试用户'}
+            }
+        }
+
+    def unread(self) -> dict:
+        return {'code': '0', 'message': 'success', 'data': {'thumb_up': 0, 'im': 6, 'totalCount': 6}}
+
+    def business_list(self, query: dict) -> dict:
+        page = int(query.get('page', ['1'])[0])
+        size = int(query.get('size', [str(self.items)])[0])
+        articles = [{
+            'articleId': page * 100000 + index,
+            'title': f'文章 {page}-{index}',
+            'description': 'x' * self.padding,
+            'url': f'https://blog.csdn.net/{USER_ID}/article/details/{page * 100000 + index}',
+            'type': 1,
+            'viewCount': index * 10,
+            'commentCount': index,
+            'diggCount': index * 2,
+            'publishTime': '2024-01-01 00:00:00'
+        } for index in range(size)]
+        return {'code': 200, 'message': 'success', 'data': {'list': articles, 'total': size * 100}}
+
+    def search(self, query: dict) -> dict:
+        keyword = query.get('q', [''])[0]
+        page = int(query.get('p', ['1'])[0])
+        results = [{
+            'title': f'{keyword} 结果 {page}-{index}',
+            'description': 'x' * self.padding,
+            'nickname': '作者',
+            'url': f'https://blog.csdn.net/author/article/details/{page * 1000 + index}',
+            'created_at': '2024-01-01 00:00:00',
+            'view_count': index * 10
+        } for index in range(self.items)]
+        return {'code': 200, 'result_vos': results, 'total': self.items * 10}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # 响应头和响应体分两次写出，关闭Nagle算法以免被延迟确认拖慢
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, data: dict):
+                time.sleep(server.latency)
+                self._send(json.dumps(data, ensure_ascii=False).encode('utf-8'),
+                           'application/json; charset=utf-8')
+
+            def do_GET(self):
+                server.request_count += 1
+                url = urlparse(self.path)
+                path, query = url.path, parse_qs(url.query, keep_blank_values=True)
+
+                if path == '/bizapi/community-personal/v1/get-personal-info':
+                    self._send_json(server.user_info())
+                elif path == '/msg/v1/web/message/view/unread':
+                    self._send_json(server.unread())
+                elif path == '/blog/community/home-api/v1/get-business-list':
+                    self._send_json(server.business_list(query))
+                elif path == '/so/api/v3/search':
+                    self._send_json(server.search(query))
+                elif path.startswith('/i/static/') or path.startswith('/so/static/') \
+                        or path.startswith('/blog/static/'):
+                    self._send(b'\x89PNG\r\n\x1a\n' + b'\0' * 1024, 'image/png')
+                elif path.startswith('/i'):
+                    self._send(USER_CENTER_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+                elif path == '/so/so/search':
+                    self._send(SEARCH_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+                elif path.startswith('/blog/'):
+                    self._send(BLOG_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+                else:
+                    self.send_error(404)
+
+        return Handler
@@ -0,0 +1,2 @@
+@echo off
+python -m src.csdn_api.cli %*
\ No newline at end of file
@@ -5,6 +5,7 @@
 import asyncio
 from loguru import logger
 from src.csdn_api.client import CSDNClient
+from src.csdn_api.utils import parse_article_data
 
 async def main():
     """主函数"""
@@ -20,14 +21,13 @@ async def main():
         articles = await client.get_article_list(page=1, size=20)
         
         # 打印文章信息
-        if articles and 'data' in articles:
-            for article in articles['data']['list']:
-                print(f"\n文章标题: {article['title']}")
-                print(f"发布时间: {article['publishTime']}")
-                print(f"阅读数: {article['viewCount']}")
-                print(f"评论数: {article['commentCount']}")
-                print(f"点赞数: {article['diggCount']}")
-                print("-" * 50)
+        for article in parse_article_data(articles):
+            print(f"\n文章标题: {article.title}")
+            print(f"发布时间: {article.publish_time}")
+            print(f"阅读数: {article.view_count}")
+            print(f"评论数: {article.comment_count}")
+            print(f"点赞数: {article.digg_count}")
+            print("-" * 50)
         
     except Exception as e:
         logger.error(f"获取文章列表失败: {str(e)}")
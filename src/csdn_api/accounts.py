@@ -0,0 +1,208 @@
+"""
+多账号管理
+每个账号一份cookies文件，所有账号共享一个浏览器，各自使用独立的浏览器上下文，
+不区分账号的调用在账号之间轮换，触发频率限制的账号暂时移出轮换
+"""
+
+import time
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+from src.csdn_api.client import CSDNClient, open_browser
+from src.csdn_api.config import get_chrome_path, get_browser_endpoint, get_profiles_dir
+from src.csdn_api.exceptions import CSDNRateLimitError, CSDNValidationError
+from src.csdn_api.metrics import Metrics
+
+
+def load_profiles(directory: str = None) -> Dict[str, Path]:
+    """读取账号配置目录
+
+    Args:
+        directory: 配置目录，默认从环境变量或配置文件获取
+
+    Returns:
+        Dict[str, Path]: 账号名到cookies文件的映射，账号名为文件名（不含扩展名）
+    """
+    directory = Path(directory or get_profiles_dir())
+    if not directory.is_dir():
+        return {}
+    return {path.stem: path for path in sorted(directory.glob('*.json'))
+            if not path.name.endswith('.identity.json')}
+
+
+class AccountPool:
+    """多账号客户端池
+
+    - 每个账号对应一个 :class:`CSDNClient`，它们共享同一个浏览器，各自使用独立的浏览器上下文，cookies互不影响
+    - :meth:`search` 等不区分账号的调用按轮转顺序分配给当前可用的账号
+    - 账号触发频率限制后在 ``cooldown`` 秒内不再参与轮换，连续触发时冷却时间加倍，最长 ``max_cooldown`` 秒
+    - :meth:`get_article_list` 等与账号相关的调用需要指定账号，直接交给对应账号的客户端
+    - :meth:`close` 时把各账号在会话中刷新过的cookies原子地写回各自的文件
+    """
+
+    def __init__(self, profiles: Dict[str, str] = None, chrome_path: str = None,
+                 browser_endpoint: str = None, pool_size: int = 1,
+                 cooldown: float = 60.0, max_cooldown: float = 900.0, **client_options):
+        """初始化多账号客户端池
+
+        Args:
+            profiles: 账号名到cookies文件的映射，默认读取账号配置目录（见 :func:`load_profiles`）
+            chrome_path: Chrome浏览器路径
+            browser_endpoint: 已运行Chrome的调试地址，指定后各账号在该浏览器中创建上下文
+            pool_size: 每个账号的页面池大小
+            cooldown: 账号触发频率限制后移出轮换的时长（秒）
+            max_cooldown: 连续触发频率限制时冷却时长的上限（秒）
+            **client_options: 传给每个 :class:`CSDNClient` 的其他参数，如 cache、use_http
+        """
+        profiles = profiles if profiles is not None else load_profiles()
+        if not profiles:
+            raise CSDNValidationError("没有可用的账号配置")
+        self.chrome_path = chrome_path or get_chrome_path()
+        self.browser_endpoint = browser_endpoint or get_browser_endpoint()
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = client_options.pop('metrics', None) or Metrics()
+        self.clients: Dict[str, CSDNClient] = {
+            name: CSDNClient(chrome_path=self.chrome_path, cookies_file=str(path),
+                             pool_size=pool_size, metrics=self.metrics,
+                             browser_factory=self._new_context, **client_options)
+            for name, path in profiles.items()
+        }
+        self._order: List[str] = list(self.clients)
+        self._cursor = 0
+        self._cooldown_until: Dict[str, float] = {}
+        self._strikes: Dict[str, int] = {}
+        self._browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def accounts(self) -> List[str]:
+        """全部账号名"""
+        return list(self._order)
+
+    @property
+    def available(self) -> List[str]:
+        """当前未处于限流冷却中的账号"""
+        now = time.monotonic()
+        return [name for name in self._order if self._cooldown_until.get(name, 0) <= now]
+
+    def client(self, account: str) -> CSDNClient:
+        """获取指定账号的客户端
+
+        Raises:
+            CSDNValidationError: 账号不存在时抛出
+        """
+        try:
+            return self.clients[account]
+        except KeyError:
+            raise CSDNValidationError(f"未知的账号: {account}")
+
+    async def _new_context(self):
+        """在共享浏览器中为一个账号创建独立的浏览器上下文"""
+        if self._browser is None:
+            if self._browser_lock is None:
+                self._browser_lock = asyncio.Lock()
+            async with self._browser_lock:
+                if self._browser is None:
+                    self._browser = await open_browser(self.chrome_path, self.browser_endpoint)
+        return await self._browser.createIncognitoBrowserContext()
+
+    def _next_account(self) -> Optional[str]:
+        """按轮转顺序返回下一个可用账号，全部处于冷却中时返回None"""
+        now = time.monotonic()
+        for _ in range(len(self._order)):
+            name = self._order[self._cursor % len(self._order)]
+            self._cursor += 1
+            if self._cooldown_until.get(name, 0) <= now:
+                return name
+        return None
+
+    async def _acquire_account(self) -> str:
+        """获取一个可用账号，全部处于冷却中时等待最早恢复的账号"""
+        while True:
+            name = self._next_account()
+            if name is not None:
+                return name
+            wait = min(self._cooldown_until.values()) - time.monotonic()
+            logger.warning(f"所有账号都处于限流冷却中，等待 {wait:.1f} 秒")
+            await asyncio.sleep(max(wait, 0.1))
+
+    def mark_rate_limited(self, account: str):
+        """把触发频率限制的账号移出轮换"""
+        strikes = self._strikes[account] = self._strikes.get(account, 0) + 1
+        delay = min(self.cooldown * 2 ** (strikes - 1), self.max_cooldown)
+        self._cooldown_until[account] = time.monotonic() + delay
+        logger.warning(f"账号 {account} 触发频率限制，{delay:.0f} 秒内不再使用")
+
+    async def _rotate(self, call: Callable[[CSDNClient], Awaitable]):
+        """在可用账号之间轮换执行调用，遇到频率限制时换下一个账号重试
+
+        Raises:
+            CSDNRateLimitError: 所有账号都触发频率限制时抛出
+        """
+        for _ in range(len(self._order)):
+            name = await self._acquire_account()
+            try:
+                result = await call(self.clients[name])
+            except CSDNRateLimitError:
+                self.mark_rate_limited(name)
+                continue
+            self._strikes.pop(name, None)
+            return result
+        raise CSDNRateLimitError("所有账号都触发了频率限制")
+
+    async def search(self, keyword: str, page: int = 1, scope: str = "all") -> Dict:
+        """搜索CSDN内容，由当前可用的账号执行"""
+        return await self._rotate(lambda client: client.search(keyword, page=page, scope=scope))
+
+    # 批量搜索只依赖 self.search，直接复用客户端的实现，请求会分散到各账号
+    search_many = CSDNClient.search_many
+
+    async def get_user_info(self, account: str) -> Dict:
+        """获取指定账号的用户信息"""
+        return await self.client(account).get_user_info()
+
+    async def get_unread_message_count(self, account: str) -> Dict:
+        """获取指定账号的未读消息数量"""
+        return await self.client(account).get_unread_message_count()
+
+    async def get_article_list(self, account: str, page: int = 1, size: int = 20,
+                               status: str = "all") -> Dict:
+        """获取指定账号的文章列表"""
+        return await self.client(account).get_article_list(page=page, size=size, status=status)
+
+    def iter_articles(self, account: str, status: str = "all", page_size: int = 20,
+                      prefetch: int = 2) -> AsyncIterator[Dict]:
+        """逐篇遍历指定账号的全部文章"""
+        return self.client(account).iter_articles(status=status, page_size=page_size, prefetch=prefetch)
+
+    async def save_cookies(self) -> List[str]:
+        """把各账号刷新过的cookies写回各自的文件
+
+        Returns:
+            List[str]: 写入了文件的账号
+        """
+        saved = []
+        for name, client in self.clients.items():
+            try:
+                if await client.save_cookies():
+                    saved.append(name)
+            except Exception as e:
+                logger.error(f"保存账号 {name} 的cookies失败: {str(e)}")
+        return saved
+
+    async def close(self):
+        """保存cookies，关闭各账号的浏览器上下文和共享浏览器"""
+        await self.save_cookies()
+        for client in self.clients.values():
+            await client.close()
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                if self.browser_endpoint:
+                    await browser.disconnect()
+                else:
+                    await browser.close()
+            except Exception as e:
+                logger.error(f"关闭浏览器失败: {str(e)}")
@@ -9,10 +9,16 @@ from datetime import datetime
 from pathlib import Path
 from pyppeteer import launch
 from loguru import logger
+from src.csdn_api.logs import log_payload
+from src.csdn_api.cassette import CassetteRecorder, record_response
+from src.csdn_api.config import get_bizapi_credentials
+from src.csdn_api.signer import string_to_sign, verify_request
 
 class RequestAnalyzer:
-    def __init__(self):
+    def __init__(self, cassette: str = 'api_requests.cassette.jsonl'):
         self.requests_log = []
+        # 目标接口的请求和响应在捕获时立即写入磁带，可用 ReplayTransport 回放
+        self.recorder = CassetteRecorder(cassette) if cassette else None
         # 定义需要分析的API端点
         self.target_urls = [
             'bizapi.csdn.net/user-api/user/getUserInfoByToken',
@@ -65,30 +71,19 @@ class RequestAnalyzer:
                 for key, value in key_headers.items():
                     logger.info(f"{key}: {value}")
                     
-                # 尝试重建签名字符串
-                try:
-                    path = request.url.split('.net')[-1]
-                    signature_parts = [
-                        request.method,
-                        path
-                    ]
-                    
-                    # 添加签名头部
-                    if 'x-ca-signature-headers' in key_headers:
-                        header_names = key_headers['x-ca-signature-headers'].split(',')
-                        for name in header_names:
-                            if name in key_headers:
-                                signature_parts.append(f"{name}:{key_headers[name]}")
-                    
-                    # 添加请求体
-                    if post_data:
-                        signature_parts.append(post_data)
+                # 按网关规则重建签名字符串，配置了AppSecret时校验签名
+                if 'x-ca-signature' in key_headers:
+                    try:
+                        _, app_secret = get_bizapi_credentials()
+                        if app_secret:
+                            ok, signature_string = verify_request(request.method, request.url, headers, app_secret)
+                            logger.info(f"签名校验: {'一致' if ok else '不一致'}")
+                        else:
+                            signature_string = string_to_sign(request.method, request.url, headers)
+                        logger.info(f"\n签名字符串:\n{signature_string}")
                         
-                    signature_string = '\n'.join(signature_parts)
-                    logger.info(f"\n推测的签名字符串:\n{signature_string}")
-                    
-                except Exception as e:
-                    logger.error(f"重建签名字符串时出错: {str(e)}")
+                    except Exception as e:
+                        logger.error(f"重建签名字符串时出错: {str(e)}")
                     
                 if post_data:
                     logger.info(f"请求体: {post_data}")
@@ -105,9 +100,11 @@ class RequestAnalyzer:
                 logger.info(f"状态码: {response.status}")
                 try:
                     resp_text = await response.text()
-                    logger.info(f"响应内容: {resp_text}")
+                    log_payload("响应内容", resp_text, level='INFO')
                 except:
                     pass
+                if self.recorder is not None:
+                    await record_response(self.recorder, response)
                     
         except Exception as e:
             logger.error(f"拦截响应时出错: {str(e)}")
@@ -176,6 +173,9 @@ class RequestAnalyzer:
             logger.error(f"分析过程出错: {str(e)}")
         finally:
             await browser.close()
+            if self.recorder is not None:
+                self.recorder.close()
+                logger.info(f"已录制 {self.recorder.count} 次请求到: {self.recorder.path.absolute()}")
 
 def main():
     """主函数"""
@@ -0,0 +1,239 @@
+"""
+文章数据
+文章列表解析为紧凑的 :class:`Article` 记录，统计时转换为按列存储的 :class:`ArticleColumns`，
+数值列使用 ``array.array`` 存储，安装了NumPy时聚合计算在NumPy中向量化执行
+"""
+
+import heapq
+import calendar
+from array import array
+from datetime import datetime
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy是可选依赖
+    np = None
+
+# 数值列及其在接口响应中的字段名
+NUMERIC_FIELDS = {
+    'view_count': 'viewCount',
+    'comment_count': 'commentCount',
+    'digg_count': 'diggCount',
+}
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class Article:
+    """单篇文章记录
+
+    使用 ``__slots__`` 存储，比接口返回的字典占用更少内存，字段访问也更快。
+    """
+
+    __slots__ = ('article_id', 'title', 'url', 'description', 'type',
+                 'view_count', 'comment_count', 'digg_count', 'publish_time')
+
+    def __init__(self, article_id: int, title: str = '', url: str = '', description: str = '',
+                 type: int = 0, view_count: int = 0, comment_count: int = 0,
+                 digg_count: int = 0, publish_time: str = ''):
+        self.article_id = article_id
+        self.title = title
+        self.url = url
+        self.description = description
+        self.type = type
+        self.view_count = view_count
+        self.comment_count = comment_count
+        self.digg_count = digg_count
+        self.publish_time = publish_time
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """从文章列表接口返回的单篇文章字典创建记录"""
+        return cls(
+            article_id=int(data.get('articleId') or 0),
+            title=data.get('title') or '',
+            url=data.get('url') or '',
+            description=data.get('description') or '',
+            type=int(data.get('type') or 0),
+            view_count=int(data.get('viewCount') or 0),
+            comment_count=int(data.get('commentCount') or 0),
+            digg_count=int(data.get('diggCount') or 0),
+            publish_time=data.get('publishTime') or '',
+        )
+
+    def to_dict(self) -> Dict:
+        """转换回接口字段名的字典"""
+        return {
+            'articleId': self.article_id,
+            'title': self.title,
+            'url': self.url,
+            'description': self.description,
+            'type': self.type,
+            'viewCount': self.view_count,
+            'commentCount': self.comment_count,
+            'diggCount': self.digg_count,
+            'publishTime': self.publish_time,
+        }
+
+    @property
+    def published_at(self) -> Optional[datetime]:
+        """发布时间，无法解析时为None"""
+        try:
+            return datetime.strptime(self.publish_time, TIME_FORMAT)
+        except ValueError:
+            return None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Article(article_id={self.article_id!r}, title={self.title!r})"
+
+
+def _timestamp(publish_time: str) -> int:
+    """把发布时间字符串按原样换算为秒数（不做时区转换），无法解析时为0"""
+    try:
+        return calendar.timegm(datetime.strptime(publish_time, TIME_FORMAT).timetuple())
+    except ValueError:
+        return 0
+
+
+def _month(publish_time: str) -> int:
+    """发布时间所在月份，形如202401，无法解析时为0"""
+    try:
+        return int(publish_time[:4]) * 100 + int(publish_time[5:7])
+    except ValueError:
+        return 0
+
+
+class ArticleColumns:
+    """按列存储的文章集合
+
+    ``article_id``、``view_count``、``comment_count``、``digg_count``、``publish_time``（秒）、
+    ``month``（形如202401）为 ``array.array`` 列，可通过 :meth:`column` 取得，
+    安装了NumPy时返回共享内存的 ``numpy.ndarray``。原始记录保存在 ``articles`` 中，
+    :meth:`top` 等返回的是这些记录。
+    """
+
+    def __init__(self):
+        self.articles: List[Article] = []
+        self._columns = {
+            'article_id': array('q'),
+            'view_count': array('q'),
+            'comment_count': array('q'),
+            'digg_count': array('q'),
+            'publish_time': array('q'),
+            'month': array('l'),
+        }
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Union[Article, Dict]]) -> 'ArticleColumns':
+        """从文章记录或接口返回的文章字典创建"""
+        columns = cls()
+        columns.extend(articles)
+        return columns
+
+    @classmethod
+    async def from_async(cls, articles: AsyncIterable[Union[Article, Dict]]) -> 'ArticleColumns':
+        """从异步迭代器创建，如 ``await ArticleColumns.from_async(client.iter_articles())``"""
+        columns = cls()
+        async for article in articles:
+            columns.append(article)
+        return columns
+
+    def append(self, article: Union[Article, Dict]):
+        """追加一篇文章"""
+        if not isinstance(article, Article):
+            article = Article.from_dict(article)
+        self.articles.append(article)
+        columns = self._columns
+        columns['article_id'].append(article.article_id)
+        columns['view_count'].append(article.view_count)
+        columns['comment_count'].append(article.comment_count)
+        columns['digg_count'].append(article.digg_count)
+        columns['publish_time'].append(_timestamp(article.publish_time))
+        columns['month'].append(_month(article.publish_time))
+
+    def extend(self, articles: Iterable[Union[Article, Dict]]):
+        """追加多篇文章"""
+        for article in articles:
+            self.append(article)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def column(self, name: str):
+        """获取一列数据
+
+        Args:
+            name: 列名
+
+        Returns:
+            安装了NumPy时为共享内存的 ``numpy.ndarray``，否则为 ``array.array``。
+            持有返回的 ``ndarray`` 期间不能再追加文章
+        """
+        data = self._columns[name]
+        if np is not None:
+            return np.frombuffer(data, dtype=data.typecode) if len(data) else np.zeros(0, dtype=data.typecode)
+        return data
+
+    def totals(self) -> Dict[str, int]:
+        """阅读、评论、点赞总数"""
+        return {name: int(self.column(name).sum()) if np is not None else sum(self._columns[name])
+                for name in NUMERIC_FIELDS}
+
+    def top(self, n: int = 10, by: str = 'view_count') -> List[Article]:
+        """按某一列取前N篇文章，从大到小排列"""
+        if by not in self._columns:
+            raise KeyError(by)
+        n = min(n, len(self))
+        if n <= 0:
+            return []
+        if np is not None:
+            # 稳定排序，数值相同时保持原有顺序，与 heapq.nlargest 一致
+            indexes = np.argsort(-self.column(by), kind='stable')[:n]
+        else:
+            values = self._columns[by]
+            indexes = heapq.nlargest(n, range(len(values)), key=values.__getitem__)
+        return [self.articles[int(index)] for index in indexes]
+
+    def monthly(self) -> Dict[str, Dict[str, int]]:
+        """按发布月份汇总文章数及阅读、评论、点赞数
+
+        Returns:
+            Dict[str, Dict[str, int]]: ``{'2024-01': {'count': 3, 'view_count': ..., ...}}``，按月份排序，
+            发布时间无法解析的文章不计入
+        """
+        result: Dict[str, Dict[str, int]] = {}
+        if np is not None:
+            months, inverse = np.unique(self.column('month'), return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(months))
+            sums = {name: np.bincount(inverse, weights=self.column(name), minlength=len(months))
+                    for name in NUMERIC_FIELDS}
+            for index, month in enumerate(months.tolist()):
+                if month:
+                    result[_format_month(month)] = {
+                        'count': int(counts[index]),
+                        **{name: int(values[index]) for name, values in sums.items()}
+                    }
+            return result
+
+        rows = zip(self._columns['month'], *(self._columns[name] for name in NUMERIC_FIELDS))
+        for month, *values in rows:
+            if not month:
+                continue
+            bucket = result.get(month)
+            if bucket is None:
+                bucket = result[month] = [0] * (len(NUMERIC_FIELDS) + 1)
+            bucket[0] += 1
+            for index, value in enumerate(values, 1):
+                bucket[index] += value
+        return {_format_month(month): {'count': bucket[0], **dict(zip(NUMERIC_FIELDS, bucket[1:]))}
+                for month, bucket in sorted(result.items())}
+
+
+def _format_month(month: int) -> str:
+    return f"{month // 100:04d}-{month % 100:02d}"
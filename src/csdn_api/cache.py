@@ -0,0 +1,247 @@
+"""
+响应缓存
+内存LRU + SQLite 两级缓存，按接口设置有效期，支持过期后先返回旧数据再后台刷新
+"""
+
+import json
+import time
+import asyncio
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from loguru import logger
+
+# 各接口的默认有效期（秒）
+DEFAULT_TTL = {
+    'search': 300,
+    'article_list': 60,
+}
+
+# 过期后仍可返回旧数据并触发后台刷新的时长（秒）
+DEFAULT_STALE = {
+    'search': 3600,
+    'article_list': 600,
+}
+
+# SQLite中最多保留的条目数
+DEFAULT_MAX_ROWS = 10000
+
+# 每写入多少次清理一次SQLite中完全过期的条目
+PURGE_INTERVAL = 100
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+def make_key(endpoint: str, params: Dict) -> str:
+    """根据接口名和规范化后的请求参数生成缓存键"""
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        normalized[name] = value
+    return endpoint + ':' + json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+def _log_refresh_error(task: asyncio.Future):
+    """记录后台刷新的失败，旧数据继续保留到完全过期"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"后台刷新缓存失败: {str(task.exception())}")
+
+
+class ResponseCache:
+    """两级响应缓存
+
+    第一级是内存中的LRU，第二级是可选的SQLite文件。
+    条目超过有效期但仍在stale窗口内时，:meth:`fetch` 直接返回旧数据，
+    同时在后台刷新，同一个键同时只会有一个刷新或加载任务，并发的未命中共用同一次请求。
+    SQLite中完全过期的条目定期删除，条目数超过 ``max_rows`` 时删除最早写入的条目。
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_entries: int = 1024,
+                 ttl: Dict[str, float] = None,
+                 stale: Dict[str, float] = None,
+                 max_rows: int = DEFAULT_MAX_ROWS):
+        """初始化缓存
+
+        Args:
+            path: SQLite文件路径，为None时只使用内存缓存
+            max_entries: 内存缓存最大条目数
+            ttl: 各接口的有效期（秒），覆盖默认值
+            stale: 各接口过期后仍可返回旧数据的时长（秒），覆盖默认值
+            max_rows: SQLite中最多保留的条目数
+        """
+        self.max_entries = max_entries
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.stale = {**DEFAULT_STALE, **(stale or {})}
+        self.max_rows = max_rows
+        self._writes = 0
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0}
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(str(Path(path)))
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)')
+            self._db.commit()
+            self.purge()
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        """依次查找内存和SQLite，SQLite命中的条目会提升到内存"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            'SELECT value, stored_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Tuple[Any, float]):
+        """写入内存LRU并淘汰最久未使用的条目"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, endpoint: str, key: str) -> Tuple[Any, Optional[str]]:
+        """读取缓存
+
+        Returns:
+            Tuple[Any, Optional[str]]: 缓存值和状态（FRESH、STALE），未命中或已完全过期时为 (None, None)
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            return None, None
+        value, stored_at = entry
+        age = time.time() - stored_at
+        ttl = self.ttl.get(endpoint, 0)
+        if age < ttl:
+            return value, FRESH
+        if age < ttl + self.stale.get(endpoint, 0):
+            return value, STALE
+        self._delete(key)
+        return None, None
+
+    def _delete(self, key: str):
+        """删除完全过期的条目"""
+        self._memory.pop(key, None)
+        if self._db is not None:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._db.commit()
+
+    def purge(self) -> int:
+        """删除SQLite中完全过期的条目，并把条目数限制在 ``max_rows`` 以内
+
+        条目按接口名（缓存键的前缀）判断是否过期，没有配置有效期的接口的条目不会再被命中，一并删除。
+
+        Returns:
+            int: 删除的条目数
+        """
+        if self._db is None:
+            return 0
+        now = time.time()
+        deleted = 0
+        endpoints = set(self.ttl) | set(self.stale)
+        for endpoint in endpoints:
+            lifetime = self.ttl.get(endpoint, 0) + self.stale.get(endpoint, 0)
+            deleted += self._db.execute(
+                'DELETE FROM responses WHERE key >= ? AND key < ? AND stored_at < ?',
+                (endpoint + ':', endpoint + ';', now - lifetime)
+            ).rowcount
+        known = ' AND '.join('NOT (key >= ? AND key < ?)' for _ in endpoints) or '1'
+        deleted += self._db.execute(
+            f'DELETE FROM responses WHERE {known}',
+            [bound for endpoint in endpoints for bound in (endpoint + ':', endpoint + ';')]
+        ).rowcount
+        deleted += self._db.execute(
+            'DELETE FROM responses WHERE key IN ('
+            'SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_rows,)
+        ).rowcount
+        self._db.commit()
+        return deleted
+
+    def set(self, key: str, value: Any):
+        """写入缓存"""
+        entry = (value, time.time())
+        self._remember(key, entry)
+        if self._db is not None:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), entry[1])
+            )
+            self._db.commit()
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                self.purge()
+
+    async def fetch(self, endpoint: str, params: Dict, loader: Callable[[], Awaitable]) -> Any:
+        """读取缓存，未命中时调用loader获取并写入
+
+        Args:
+            endpoint: 接口名，用于选择有效期
+            params: 请求参数
+            loader: 实际发起请求的协程函数
+
+        Returns:
+            Any: 接口响应
+        """
+        key = make_key(endpoint, params)
+        value, state = self.get(endpoint, key)
+        if state == FRESH:
+            self.stats['hits'] += 1
+            return value
+        if state == STALE:
+            self.stats['stale_hits'] += 1
+            if key not in self._refreshing:
+                self._load(key, loader).add_done_callback(_log_refresh_error)
+            return value
+
+        self.stats['misses'] += 1
+        # 同一个键已有请求在进行时等待它的结果，调用方被取消不影响共享的请求
+        return await asyncio.shield(self._refreshing.get(key) or self._load(key, loader))
+
+    def _load(self, key: str, loader: Callable[[], Awaitable]) -> asyncio.Future:
+        """启动加载任务，完成后写入缓存，同一个键同时只有一个任务"""
+        async def load():
+            try:
+                value = await loader()
+                self.set(key, value)
+                return value
+            finally:
+                self._refreshing.pop(key, None)
+
+        task = self._refreshing[key] = asyncio.ensure_future(load())
+        return task
+
+    def clear(self):
+        """清空全部缓存"""
+        self._memory.clear()
+        if self._db is not None:
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def close(self):
+        """取消后台刷新并关闭SQLite连接"""
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,159 @@
+"""
+页面响应捕获
+在导航前安装URL匹配器，目标接口的JSON一到达就返回，不再依赖固定等待和刷新页面
+"""
+
+import re
+import asyncio
+import itertools
+import weakref
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Pattern, Union
+from loguru import logger
+from src.csdn_api.exceptions import CSDNAPIError
+
+
+class ResponseRouter:
+    """页面响应路由器
+
+    每个页面只注册一个 ``response`` 监听器，由它把响应分发给当前的订阅。
+    订阅使用预编译的正则（``pattern.match``）匹配URL，只在单次调用内有效，
+    命中、超时或出错后都会自动移除，因此每个响应的处理开销与客户端已处理的调用次数无关。
+    """
+
+    def __init__(self, page):
+        self._subscriptions: Dict[int, tuple] = {}
+        self._ids = itertools.count()
+        page.on('response', self._dispatch)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def _dispatch(self, response):
+        """分发响应，未命中任何订阅的响应不会创建任务"""
+        if not self._subscriptions:
+            return
+        url = response.url
+        for sub_id, (pattern, future) in list(self._subscriptions.items()):
+            if pattern.match(url):
+                # 订阅是一次性的，命中后立即移除
+                del self._subscriptions[sub_id]
+                if not future.done():
+                    asyncio.ensure_future(response.json()).add_done_callback(
+                        lambda task, future=future: _settle(future, task))
+
+    @contextmanager
+    def subscribe(self, pattern: Union[str, Pattern]):
+        """订阅第一个URL匹配的响应
+
+        Args:
+            pattern: URL正则，字符串会被编译
+
+        Yields:
+            asyncio.Future: 以响应JSON为结果的Future，退出上下文时订阅被移除
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        future = asyncio.get_event_loop().create_future()
+        sub_id = next(self._ids)
+        self._subscriptions[sub_id] = (pattern, future)
+        try:
+            yield future
+        finally:
+            self._subscriptions.pop(sub_id, None)
+
+
+_routers = weakref.WeakKeyDictionary()
+
+
+def get_router(page) -> ResponseRouter:
+    """获取页面的响应路由器，首次调用时创建"""
+    router = _routers.get(page)
+    if router is None:
+        router = _routers[page] = ResponseRouter(page)
+    return router
+
+
+def _settle(future: asyncio.Future, task: asyncio.Future):
+    """把读取响应JSON的任务结果转交给订阅的Future"""
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception():
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+async def navigate(page, url: str):
+    """发起导航，不等待页面加载完成
+
+    通过 ``Page.navigate`` 直接发起导航，只等待主文档提交。
+    如果页面已停留在同一文档、仅hash路由不同（如 i.csdn.net 的单页应用），
+    hash跳转不会重新请求接口，此时改为整页重新加载。
+
+    Args:
+        page: 浏览器页面
+        url: 目标地址
+    """
+    client = page._client
+    same_document = '#' in url and page.url.split('#')[0] == url.split('#')[0]
+    result = await client.send('Page.navigate', {'url': url})
+    if result.get('errorText'):
+        raise CSDNAPIError(f"页面导航失败: {result['errorText']}")
+    if same_document:
+        await client.send('Page.reload', {})
+
+
+async def stop_loading(page):
+    """中止页面剩余资源的加载"""
+    try:
+        await page._client.send('Page.stopLoading')
+    except Exception as e:
+        logger.debug(f"中止页面加载失败: {str(e)}")
+
+
+async def capture_response(page,
+                           pattern: Union[str, Pattern],
+                           action: Callable[[], Awaitable],
+                           timeout: float = 10.0,
+                           abort_load: bool = True) -> Dict:
+    """执行动作并捕获第一个匹配的响应JSON
+
+    订阅在执行 ``action`` 之前注册到页面的 :class:`ResponseRouter`，
+    因此不会漏掉导航过程中发出的请求。捕获完成或超时后订阅自动移除。
+
+    Args:
+        page: 浏览器页面
+        pattern: URL正则，使用 ``match`` 从URL开头匹配
+        action: 触发目标请求的协程函数，如导航或执行fetch
+        timeout: 从执行动作开始计算的超时时间（秒）
+        abort_load: 捕获成功后是否中止页面剩余资源的加载
+
+    Returns:
+        Dict: 响应JSON
+
+    Raises:
+        asyncio.TimeoutError: 超时未捕获到目标响应
+    """
+    with get_router(page).subscribe(pattern) as future:
+        await asyncio.wait_for(_run_until(action, future), timeout)
+
+    if abort_load:
+        await stop_loading(page)
+    return future.result()
+
+
+async def _run_until(action: Callable[[], Awaitable], future: asyncio.Future):
+    """执行动作后等待响应，动作尚未返回时响应先到达也会立即结束"""
+    action_task = asyncio.ensure_future(action())
+    try:
+        await asyncio.wait({action_task, future}, return_when=asyncio.FIRST_COMPLETED)
+        if not future.done():
+            # 动作已结束（可能失败），继续等待响应
+            action_task.result()
+            await future
+    finally:
+        if not action_task.done():
+            action_task.cancel()
@@ -0,0 +1,227 @@
+"""
+请求录制与回放
+录制器把每次捕获的请求和响应立即追加到磁带文件（JSON Lines，每行一次交换），
+回放传输层按地址和查询参数返回录制的响应，客户端无需浏览器和网络即可运行
+
+磁带中每条记录的字段：
+    url: 请求地址，不含查询参数
+    params: 查询参数，值统一为字符串
+    method: 请求方法
+    status: HTTP状态码
+    response: 响应JSON，响应不是JSON时为None并改为记录 ``text``
+    headers / post_data: 录制时可选的请求头和请求体
+    recorded_at: 录制时间
+"""
+
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from loguru import logger
+from src.csdn_api.exceptions import (
+    CSDNAuthError, CSDNAPIError, CSDNBlockedError, CSDNRateLimitError
+)
+from src.csdn_api.transport import AUTH_FAILURE_CODES
+from src.csdn_api.utils import check_rate_limit
+
+
+def split_url(url: str, params: Dict = None) -> Tuple[str, Dict[str, str]]:
+    """拆分出不含查询参数的地址，并把地址中的查询参数与 ``params`` 合并
+
+    参数值统一转为字符串，``1`` 和 ``'1'`` 视为相同。
+
+    Returns:
+        Tuple[str, Dict[str, str]]: (地址, 查询参数)
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    for key, value in (params or {}).items():
+        query[str(key)] = '' if value is None else str(value)
+    return urlunsplit(parts._replace(query='', fragment='')), query
+
+
+def exchange_key(url: str, params: Dict = None) -> str:
+    """回放时匹配录制记录的键，查询参数按名称排序"""
+    base, query = split_url(url, params)
+    return base + '?' + urlencode(sorted(query.items())) if query else base
+
+
+def load_cassette(path: Union[str, Path]) -> Iterator[Dict]:
+    """逐条读取磁带，跳过录制中断时写了一半的行"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"跳过磁带中无法解析的第 {number} 行: {path}")
+
+
+class CassetteRecorder:
+    """把请求和响应逐条追加写入磁带文件
+
+    每条记录写入后立即刷新，进程中途退出时已捕获的交换不会丢失。
+    可以在多个线程和协程中共用。
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = True):
+        """初始化录制器
+
+        Args:
+            path: 磁带文件路径，建议以 ``.jsonl`` 结尾
+            append: 是否追加到已有磁带，为False时清空重录
+        """
+        self.path = Path(path)
+        self.count = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+
+    def record(self, url: str, response=None, params: Dict = None, method: str = 'GET',
+               status: int = 200, text: str = None, headers: Dict = None, post_data: str = None):
+        """写入一次请求和响应
+
+        Args:
+            url: 请求地址，可以带查询参数
+            response: 响应JSON
+            params: 查询参数
+            method: 请求方法
+            status: HTTP状态码
+            text: 响应不是JSON时的原始文本
+            headers: 请求头
+            post_data: 请求体
+        """
+        base, query = split_url(url, params)
+        entry = {'url': base, 'params': query, 'method': method, 'status': status, 'response': response}
+        if text is not None:
+            entry['text'] = text
+        if headers:
+            entry['headers'] = headers
+        if post_data:
+            entry['post_data'] = post_data
+        entry['recorded_at'] = datetime.now().isoformat()
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        """关闭磁带文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def record_response(recorder: CassetteRecorder, response):
+    """把pyppeteer页面响应及其请求写入磁带，读取响应体失败（如重定向）时只记录状态码"""
+    request = response.request
+    text = None
+    data = None
+    try:
+        text = await response.text()
+        data = json.loads(text)
+        text = None
+    except Exception:
+        pass
+    recorder.record(response.url, data, method=request.method, status=response.status, text=text,
+                    headers=dict(request.headers), post_data=request.postData)
+
+
+class ReplayTransport:
+    """从磁带回放响应的传输层
+
+    与 :class:`HttpTransport` 接口相同，可通过 ``CSDNClient(transport=...)`` 使用。
+    磁带中包含页面接口（用户信息、未读消息）的记录时，客户端同样从磁带读取而不启动浏览器；
+    没有这些记录时客户端抛出 :class:`CSDNAPIError`，同样不会启动浏览器。
+
+    同一地址和参数录制了多次时按录制顺序依次返回，用完后重复返回最后一次，
+    因此同一磁带的每次运行结果完全相同。录制的错误同样原样抛出，客户端不会回退到浏览器。
+    """
+
+    browser_fallback = False
+    rate_limited = False
+
+    def __init__(self, cassette: Union[str, Path, List[Dict]], strict: bool = True):
+        """初始化回放传输层
+
+        Args:
+            cassette: 磁带文件路径，或已读取的记录列表
+            strict: 没有参数完全匹配的记录时是否报错，为False时返回同一地址最后录制的响应
+        """
+        entries = cassette if isinstance(cassette, list) else list(load_cassette(cassette))
+        self.strict = strict
+        self._exchanges: Dict[str, List[Dict]] = defaultdict(list)
+        self._latest: Dict[str, Dict] = {}
+        self._cursors: Dict[str, int] = {}
+        for entry in entries:
+            if (entry.get('method') or 'GET').upper() != 'GET':
+                continue
+            self._exchanges[exchange_key(entry['url'], entry.get('params'))].append(entry)
+            self._latest[split_url(entry['url'])[0]] = entry
+        logger.info(f"已载入 {sum(map(len, self._exchanges.values()))} 条录制记录")
+
+    def supports(self, url: str) -> bool:
+        """磁带中是否录制了该地址"""
+        return split_url(url)[0] in self._latest
+
+    def _lookup(self, url: str, params: Dict = None) -> Optional[Dict]:
+        """按录制顺序取出下一条匹配的记录"""
+        key = exchange_key(url, params)
+        exchanges = self._exchanges.get(key)
+        if exchanges:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = min(cursor + 1, len(exchanges) - 1)
+            return exchanges[cursor]
+        if not self.strict:
+            return self._latest.get(split_url(url)[0])
+        return None
+
+    async def get_json(self, url: str, params: Dict = None, headers: Dict = None) -> Dict:
+        """返回录制的响应JSON，错误状态按 :class:`HttpTransport` 的规则抛出异常
+
+        Raises:
+            CSDNAPIError: 磁带中没有匹配的记录时抛出
+        """
+        entry = self._lookup(url, params)
+        if entry is None:
+            raise CSDNAPIError(f"磁带中没有匹配的记录: {exchange_key(url, params)}")
+
+        status = entry.get('status') or 200
+        data = entry.get('response')
+        if status in (401, 403):
+            raise CSDNAuthError(f"认证失败: HTTP {status}")
+        if status == 429:
+            raise CSDNRateLimitError("请求频率超限")
+        if data is None:
+            raise CSDNBlockedError(f"响应不是JSON，可能触发了反爬验证: HTTP {status}")
+        if status >= 400:
+            raise CSDNAPIError(f"请求失败: HTTP {status}", status_code=status, response=entry.get('text'))
+        if isinstance(data, dict) and data.get('code') in AUTH_FAILURE_CODES:
+            message = data.get('message') or data.get('msg') or ''
+            raise CSDNAuthError(f"认证失败: {message}")
+        check_rate_limit(data)
+        return data
+
+    def reload_cookies(self):
+        """回放不使用cookies"""
+
+    def export_cookies(self) -> List[Dict]:
+        """回放不使用cookies"""
+        return []
+
+    def close(self):
+        """回放没有需要释放的资源"""
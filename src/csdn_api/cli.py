@@ -0,0 +1,235 @@
+"""
+CSDN 命令行工具
+结果以JSON Lines格式逐条写到标准输出，每得到一条就立即输出，便于管道中的下游程序边读边处理
+
+用法：
+    python -m src.csdn_api.cli search Python Rust --pages 3
+    python -m src.csdn_api.cli articles --status published
+    python -m src.csdn_api.cli unread
+    python -m src.csdn_api.cli whoami
+    python -m src.csdn_api.cli --replay session.jsonl articles
+
+浏览器、HTTP会话等较重的依赖只在子命令真正需要时才导入。
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+
+def emit(record):
+    """输出一条JSON记录并立即刷新"""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def create_client(args):
+    """创建CSDN客户端，在此处才导入客户端及其依赖"""
+    from src.csdn_api.client import CSDNClient
+    from src.csdn_api.cache import ResponseCache
+    from src.csdn_api.logs import configure_logging
+
+    # 标准输出只用于结果，日志写到标准错误；未配置日志级别时只输出警告
+    configure_logging(level="INFO" if args.verbose else None, default_level="WARNING")
+
+    cache = ResponseCache(args.cache or None) if args.cache is not None else None
+    search_index = None
+    if getattr(args, 'index', None):
+        from src.csdn_api.search_index import SearchIndex
+        search_index = SearchIndex(args.index)
+    transport = recorder = None
+    if args.replay:
+        from src.csdn_api.cassette import ReplayTransport
+        transport = ReplayTransport(args.replay)
+    if args.record:
+        from src.csdn_api.cassette import CassetteRecorder
+        recorder = CassetteRecorder(args.record)
+    return CSDNClient(cookies_file=args.cookies, pool_size=args.pool_size, cache=cache,
+                      search_index=search_index, transport=transport, recorder=recorder)
+
+
+def search_offline(args):
+    """只查本地搜索索引，不创建客户端"""
+    from src.csdn_api.search_index import SearchIndex
+
+    index = SearchIndex(args.index)
+    try:
+        for keyword in args.keywords:
+            for page in range(1, args.pages + 1):
+                hits = index.query(keyword, limit=20, offset=(page - 1) * 20)
+                if not hits:
+                    break
+                for item in hits:
+                    emit({'keyword': keyword, 'page': page, 'result': item})
+    finally:
+        index.close()
+
+
+async def cmd_search(client, args):
+    failed = []
+    results = client.search_many(
+        args.keywords, pages=args.pages, scope=args.scope, concurrency=args.concurrency,
+        on_error=lambda keyword, page, error: failed.append((keyword, page)))
+    try:
+        async for keyword, page, item in results:
+            emit({'keyword': keyword, 'page': page, 'result': item})
+    finally:
+        # 提前退出（如管道关闭）时取消尚未完成的请求
+        await results.aclose()
+    if failed:
+        # 部分页失败时结果不完整，以非零退出码告知调用方
+        sys.stderr.write(f"{len(failed)} 个搜索页请求失败: "
+                         + ', '.join(f"{keyword}#{page}" for keyword, page in failed) + "\n")
+        return 1
+
+
+async def cmd_articles(client, args):
+    articles = client.iter_articles(status=args.status, page_size=args.page_size)
+    count = 0
+    try:
+        async for article in articles:
+            emit(article)
+            count += 1
+            if args.limit and count >= args.limit:
+                break
+    finally:
+        await articles.aclose()
+
+
+async def cmd_export(client, args):
+    from src.csdn_api.export import export_articles
+
+    emit(await export_articles(client, args.path, fmt=args.format, status=args.status,
+                               page_size=args.page_size, restart=args.restart))
+
+
+async def cmd_sync(client, args):
+    from src.csdn_api.sync import ArticleIndex, sync_articles
+
+    index = ArticleIndex(args.index)
+    try:
+        result = await sync_articles(client, index, status=args.status, page_size=args.page_size,
+                                     full=args.full)
+    finally:
+        index.close()
+    for change in ('new', 'changed'):
+        for article in result[change]:
+            emit({'change': change, 'article': article})
+
+
+async def cmd_unread(client, args):
+    emit(await client.get_unread_message_count())
+
+
+async def cmd_whoami(client, args):
+    emit(await client.get_user_info())
+
+
+async def run(args) -> int:
+    """执行子命令，返回退出码"""
+    try:
+        client = create_client(args)
+    except Exception as e:
+        # 如磁带文件不存在
+        sys.stderr.write(f"{type(e).__name__}: {e}\n")
+        return 1
+    try:
+        # 子命令可以返回非零退出码表示部分失败
+        return await args.handler(client, args) or 0
+    except BrokenPipeError:
+        raise
+    except Exception as e:
+        sys.stderr.write(f"{type(e).__name__}: {e}\n")
+        return 1
+    finally:
+        await client.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='csdn', description="CSDN 命令行工具，结果以JSON Lines输出")
+    parser.add_argument('--cookies', help="cookies文件路径")
+    parser.add_argument('--pool-size', type=int, default=1, help="页面池大小")
+    parser.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                        help="启用响应缓存，可选指定SQLite文件路径")
+    parser.add_argument('--record', metavar='PATH', help="把接口响应逐条录制到磁带文件")
+    parser.add_argument('--replay', metavar='PATH', help="从磁带文件回放响应，不启动浏览器也不访问网络")
+    parser.add_argument('-v', '--verbose', action='store_true', help="在标准错误输出详细日志")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    search = subparsers.add_parser('search', help="搜索，每条结果一行")
+    search.add_argument('keywords', nargs='+', help="搜索关键词")
+    search.add_argument('--pages', type=int, default=1, help="每个关键词搜索的页数")
+    search.add_argument('--scope', default='all', help="搜索范围，如all、blog")
+    search.add_argument('--concurrency', type=int, default=8, help="最大并发请求数")
+    search.add_argument('--index', metavar='PATH', help="本地搜索索引的SQLite文件，搜索结果都会收录其中")
+    search.add_argument('--offline', action='store_true', help="只查本地搜索索引，不访问CSDN（需要--index）")
+    search.set_defaults(handler=cmd_search)
+
+    articles = subparsers.add_parser('articles', help="遍历自己的文章，每篇一行")
+    articles.add_argument('--status', default='all', choices=['all', 'published', 'draft'], help="文章状态")
+    articles.add_argument('--page-size', type=int, default=20, help="每页数量")
+    articles.add_argument('--limit', type=int, default=0, help="最多输出的文章数，0表示不限")
+    articles.set_defaults(handler=cmd_articles)
+
+    export = subparsers.add_parser('export', help="导出全部文章到压缩文件，中断后再次执行会继续导出")
+    export.add_argument('path', help="导出文件路径，如 articles.jsonl.gz")
+    export.add_argument('--format', default='jsonl', choices=['jsonl', 'columns'], help="导出格式")
+    export.add_argument('--status', default='all', choices=['all', 'published', 'draft'], help="文章状态")
+    export.add_argument('--page-size', type=int, default=20, help="每页数量")
+    export.add_argument('--restart', action='store_true', help="忽略检查点，从头导出")
+    export.set_defaults(handler=cmd_export)
+
+    sync = subparsers.add_parser('sync', help="增量同步文章到本地索引，只输出新增或有变化的文章")
+    sync.add_argument('--index', default='articles.db', help="本地索引的SQLite文件路径")
+    sync.add_argument('--status', default='all', choices=['all', 'published', 'draft'], help="文章状态")
+    sync.add_argument('--page-size', type=int, default=20, help="每页数量")
+    sync.add_argument('--full', action='store_true', help="翻完全部页，用于更新较早文章的计数")
+    sync.set_defaults(handler=cmd_sync)
+
+    unread = subparsers.add_parser('unread', help="未读消息数量")
+    unread.set_defaults(handler=cmd_unread)
+
+    whoami = subparsers.add_parser('whoami', help="当前登录用户信息")
+    whoami.set_defaults(handler=cmd_whoami)
+    return parser
+
+
+def main(argv=None) -> int:
+    """主函数"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'offline', False):
+        if not args.index:
+            parser.error("--offline 需要同时指定 --index")
+        try:
+            search_offline(args)
+        except BrokenPipeError:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+        return 0
+
+    # 使用新的事件循环
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(run(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # 下游程序（如 head）提前关闭了管道，丢弃剩余输出
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        # 取消被提前中断的后台任务，避免关闭事件循环时报错
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
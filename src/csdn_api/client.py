@@ -3,69 +3,460 @@ CSDN API 客户端
 处理与 CSDN 的所有交互
 """
 
+import re
 import json
+import time
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, List, Tuple
+from urllib.parse import urlencode
 from loguru import logger
-from pyppeteer import launch
-from src.csdn_api.exceptions import CSDNAuthError, CSDNAPIError
-from src.csdn_api.config import get_chrome_path
+from pyppeteer import connect, launch
+from src.csdn_api.exceptions import (
+    CSDNError, CSDNAuthError, CSDNAPIError, CSDNBlockedError, CSDNRateLimitError, CSDNTimeoutError
+)
+from src.csdn_api.config import get_chrome_path, get_browser_endpoint, get_user_data_dir
+from src.csdn_api.pool import PagePool
+from src.csdn_api.transport import HttpTransport
+from src.csdn_api.capture import capture_response, navigate
+from src.csdn_api.identity import IdentityCache
+from src.csdn_api.cache import ResponseCache
+from src.csdn_api.utils import AsyncRateLimiter, write_json_atomic
+from src.csdn_api.intercept import RequestPolicy
+from src.csdn_api.metrics import Metrics, instrument
+from src.csdn_api.logs import log_payload
+from src.csdn_api.search_index import SearchIndex
+from src.csdn_api.cassette import CassetteRecorder
+from src.csdn_api.session import login_state, merge_cookies
+from src.csdn_api.signer import BizapiSigner
+
+# 各接口所在的主机，用于限流
+BIZAPI_HOST = 'bizapi.csdn.net'
+MSG_HOST = 'msg.csdn.net'
+BLOG_HOST = 'blog.csdn.net'
+SEARCH_HOST = 'so.csdn.net'
+
+# 页面加载时发出的目标接口
+USER_INFO_URL = 'https://bizapi.csdn.net/community-personal/v1/get-personal-info'
+UNREAD_MESSAGE_URL = 'https://msg.csdn.net/v1/web/message/view/unread'
+
+# 可以直接携带cookies请求的接口
+BUSINESS_LIST_URL = 'https://blog.csdn.net/community/home-api/v1/get-business-list'
+SEARCH_API_URL = 'https://so.csdn.net/api/v3/search'
+
+# 页面地址
+PROFILE_PAGE_URL = 'https://i.csdn.net/#/user-center/profile'
+MESSAGE_PAGE_URL = 'https://i.csdn.net/#/msg/index'
+BLOG_HOME_URL = 'https://blog.csdn.net/'
+SEARCH_PAGE_URL = 'https://so.csdn.net/so/search'
+
+# 本地搜索索引每页返回的条数
+LOCAL_PAGE_SIZE = 20
+
+# 保存cookies时读取这些地址下的cookie
+COOKIE_URLS = (
+    'https://www.csdn.net/',
+    'https://passport.csdn.net/',
+    'https://i.csdn.net/',
+    'https://bizapi.csdn.net/',
+    'https://msg.csdn.net/',
+    'https://blog.csdn.net/',
+    'https://so.csdn.net/',
+)
+
+VIEWPORT = {'width': 1366, 'height': 768}
+
+def _format_remaining(seconds: Optional[float]) -> str:
+    """把剩余秒数格式化为便于阅读的文本"""
+    if seconds is None:
+        return "不限（会话cookie）"
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f} 天"
+    return f"{seconds / 3600:.1f} 小时"
+
+def build_search_params(keyword: str, page: int, scope: str) -> Dict:
+    """构建搜索接口的查询参数"""
+    return {
+        'q': keyword, 't': scope, 'p': page, 's': 0, 'tm': 0, 'lv': -1, 'ft': 0,
+        'l': '', 'u': '', 'ct': -1, 'pnt': -1, 'ry': -1, 'ss': -1, 'dct': -1,
+        'vco': -1, 'cc': -1, 'sc': -1, 'akt': -1, 'art': -1, 'ca': -1,
+        'prs': '', 'pre': '', 'ecc': -1, 'ebc': -1, 'ia': 1, 'platform': 'pc'
+    }
+
+async def open_browser(chrome_path: str, endpoint: str = None, user_data_dir: str = None):
+    """启动浏览器，指定调试地址时改为连接到已运行的浏览器
+    
+    Args:
+        chrome_path: Chrome浏览器路径
+        endpoint: 已运行Chrome的调试地址（ws://... 或 http://host:port）
+        user_data_dir: Chrome用户数据目录
+    """
+    if endpoint:
+        logger.info(f"连接到已运行的浏览器: {endpoint}")
+        key = 'browserWSEndpoint' if endpoint.startswith('ws') else 'browserURL'
+        return await connect({key: endpoint, 'defaultViewport': VIEWPORT})
+
+    logger.info("启动浏览器...")
+    options = {'userDataDir': user_data_dir} if user_data_dir else {}
+    return await launch(
+        headless=True,
+        executablePath=chrome_path,
+        args=['--no-sandbox', '--window-size=1366,768'],
+        defaultViewport=VIEWPORT,
+        **options
+    )
 
 class CSDNClient:
     """CSDN API 客户端类"""
     
-    def __init__(self, chrome_path: str = None, cookies_file: str = None):
+    def __init__(self, chrome_path: str = None, cookies_file: str = None,
+                 pool_size: int = 1, browsers: int = 1, use_http: bool = True,
+                 identity_ttl: float = 3600, persist_identity: bool = False,
+                 cache: ResponseCache = None, rate_limiter: AsyncRateLimiter = None,
+                 block_resources: bool = True, request_policy: RequestPolicy = None,
+                 browser_endpoint: str = None, user_data_dir: str = None,
+                 url_map: Dict[str, str] = None, metrics: Metrics = None,
+                 browser_factory: Callable[[], Awaitable] = None,
+                 search_index: SearchIndex = None, transport=None,
+                 recorder: CassetteRecorder = None, signer: BizapiSigner = None):
         """初始化CSDN API客户端
         
         Args:
             chrome_path (str, optional): Chrome浏览器路径，如果不指定则从环境变量或配置文件获取
             cookies_file (str, optional): cookies文件路径
+            pool_size (int, optional): 页面池大小，即同一客户端上可并发执行的调用数
+            browsers (int, optional): 浏览器实例数量，页面会平均分配到各浏览器上
+            use_http (bool, optional): 是否优先通过HTTP直连请求接口，失败时回退到浏览器
+            identity_ttl (float, optional): 用户ID缓存有效期（秒）
+            persist_identity (bool, optional): 是否将用户ID缓存保存到cookies文件旁边
+            cache (ResponseCache, optional): 响应缓存，用于search和get_article_list
+            rate_limiter (AsyncRateLimiter, optional): 按主机限流的限流器，默认使用内置速率
+            block_resources (bool, optional): 是否拦截图片、字体、媒体及统计广告脚本等请求
+            request_policy (RequestPolicy, optional): 自定义请求拦截策略，默认使用内置规则
+            browser_endpoint (str, optional): 已运行Chrome的调试地址（ws://... 或 http://host:port），
+                指定后连接到该浏览器而不是启动新浏览器
+            user_data_dir (str, optional): 持久化的Chrome用户数据目录，HTTP缓存等在多次运行间保留；
+                此时拦截策略改为按URL通配符屏蔽请求，因为请求拦截会禁用HTTP缓存
+            url_map (Dict[str, str], optional): 地址前缀映射，如 {'https://so.csdn.net': 'http://127.0.0.1:8080/so'}，
+                用于把请求发往本地替身服务器进行测试
+            metrics (Metrics, optional): 指标收集器，默认新建一个，可通过 ``client.metrics`` 导出
+            browser_factory (Callable, optional): 返回浏览器或浏览器上下文的协程函数，
+                指定后不再自行启动浏览器，关闭客户端时关闭其返回的对象（多账号共享浏览器时使用）
+            search_index (SearchIndex, optional): 本地搜索索引，search的结果都会收录其中，
+                并可通过 ``search(..., local_first=True)`` 优先离线检索
+            transport (optional): 自定义传输层，如从磁带回放的 :class:`ReplayTransport`，指定后忽略use_http；
+                传输层的 ``supports()`` 对页面接口返回True时，用户信息和未读消息也不再经过浏览器
+            recorder (CassetteRecorder, optional): 录制器，每次从接口取得的响应都会立即写入磁带
+            signer (BizapiSigner, optional): bizapi请求签名器，默认按配置的 ``bizapi_key``、``bizapi_secret`` 创建；
+                有签名器时用户信息等bizapi接口通过HTTP直连，不再加载页面
         """
         self.chrome_path = chrome_path or get_chrome_path()
         self.cookies_file = Path(cookies_file) if cookies_file else Path("cookies.json")
-        self.browser = None
-        self.page = None
+        self.browser_endpoint = browser_endpoint or get_browser_endpoint()
+        self.user_data_dir = user_data_dir or get_user_data_dir()
+        self.browser_factory = browser_factory
+        self.pool = PagePool(self._launch_browser, self._setup_page,
+                             size=pool_size, browsers=browsers,
+                             close_browser=self._release_browser)
+        self._launched = 0
+        self.url_map = url_map or {}
+
+        # 预编译的响应匹配规则
+        self._patterns = {
+            'user_info': re.compile(re.escape(self._url(USER_INFO_URL)) + '$'),
+            'unread_message': re.compile(re.escape(self._url(UNREAD_MESSAGE_URL)) + '$'),
+            'business_list': re.compile(re.escape(self._url(BUSINESS_LIST_URL))),
+            'search': re.compile(re.escape(self._url(SEARCH_API_URL))),
+        }
+        self._cookies = None
+        if transport is not None:
+            self.transport = transport
+        else:
+            self.transport = HttpTransport(
+                self.cookies_file, pool_size=max(10, pool_size),
+                signer=signer or BizapiSigner.from_config()) if use_http else None
+        self.identity = IdentityCache(self.cookies_file, ttl=identity_ttl, persist=persist_identity)
+        self.cache = cache
+        self.limiter = rate_limiter or AsyncRateLimiter()
+        self.request_policy = (request_policy or RequestPolicy()) if block_resources else None
+        self.metrics = metrics or Metrics()
+        self.search_index = search_index
+        self.recorder = recorder
+        self._keepalive: Optional[asyncio.Task] = None
+
+    def _url(self, url: str) -> str:
+        """按url_map替换地址前缀"""
+        for prefix, target in self.url_map.items():
+            if url.startswith(prefix):
+                return target + url[len(prefix):]
+        return url
+
+    @property
+    def browser(self):
+        """第一个浏览器实例，未初始化时为None"""
+        return self.pool.browsers[0] if self.pool.browsers else None
         
+    async def _launch_browser(self):
+        """启动一个浏览器实例，配置了调试地址时改为连接到已运行的浏览器"""
+        if self.browser_factory:
+            return await self.browser_factory()
+        if self.browser_endpoint:
+            return await open_browser(self.chrome_path, self.browser_endpoint)
+
+        user_data_dir = None
+        if self.user_data_dir:
+            # 每个浏览器实例需要独立的用户数据目录
+            user_data_dir = Path(self.user_data_dir)
+            if self._launched:
+                user_data_dir = user_data_dir / f"browser-{self._launched}"
+            user_data_dir = str(user_data_dir)
+        self._launched += 1
+        return await open_browser(self.chrome_path, user_data_dir=user_data_dir)
+
+    async def _release_browser(self, browser):
+        """释放浏览器，连接的外部浏览器只断开连接而不关闭"""
+        if self.browser_endpoint and not self.browser_factory:
+            await browser.disconnect()
+        else:
+            await browser.close()
+
+    async def _setup_page(self, page):
+        """为新页面启用请求拦截并加载cookies"""
+        if self.request_policy:
+            # 使用持久化用户数据目录时保留HTTP缓存，不启用请求拦截
+            await self.request_policy.install(page, keep_cache=bool(self.user_data_dir))
+        if self._cookies is None:
+            self._cookies = []
+            if self.cookies_file.exists():
+                try:
+                    with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                        self._cookies = json.load(f)
+                    logger.info(f"已加载 {len(self._cookies)} 个cookies")
+                except Exception as e:
+                    logger.error(f"加载cookies失败: {str(e)}")
+        if self._cookies:
+            await page.setCookie(*self._cookies)
+
     async def init(self):
-        """初始化浏览器"""
-        if not self.browser:
-            logger.info("启动浏览器...")
-            try:
-                self.browser = await launch(
-                    headless=True,
-                    executablePath=self.chrome_path,
-                    args=['--no-sandbox', '--window-size=1366,768'],
-                    defaultViewport={'width': 1366, 'height': 768}
-                )
-                
-                self.page = await self.browser.newPage()
-                
-                # 加载cookies
-                if self.cookies_file.exists():
-                    try:
-                        with open(self.cookies_file, 'r', encoding='utf-8') as f:
-                            cookies = json.load(f)
-                        await self.page.setCookie(*cookies)
-                        logger.info(f"已加载 {len(cookies)} 个cookies")
-                    except Exception as e:
-                        logger.error(f"加载cookies失败: {str(e)}")
-                        
-            except Exception as e:
-                logger.error(f"浏览器启动失败: {str(e)}")
-                if self.browser:
-                    await self.browser.close()
-                self.browser = None
-                self.page = None
-                raise
+        """初始化浏览器和页面池"""
+        if self.pool.started:
+            return
+        try:
+            with self.metrics.span('client', 'launch'):
+                await self.pool.start()
+        except Exception as e:
+            logger.error(f"浏览器启动失败: {str(e)}")
+            raise
     
     async def close(self):
-        """关闭浏览器"""
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
-            self.page = None
+        """关闭浏览器和HTTP会话"""
+        await self.stop_keepalive()
+        await self.pool.close()
+        if self.transport:
+            self.transport.close()
+        if self.cache:
+            self.cache.close()
+        if self.search_index is not None:
+            self.search_index.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    async def save_cookies(self) -> bool:
+        """把会话中刷新过的cookies写回cookies文件
+
+        合并浏览器页面和HTTP会话中的cookies，按 (name, domain, path) 覆盖文件中的旧值，
+        通过临时文件原子替换，内容没有变化时不写入。
+
+        Returns:
+            bool: 是否写入了文件
+        """
+        fresh = await self._live_cookies()
+        if not fresh:
+            return False
+
+        existing = self._read_cookies_file()
+        cookies = merge_cookies(existing, fresh)
+        if cookies == existing:
+            return False
+
+        write_json_atomic(self.cookies_file, cookies)
+        self._cookies = cookies
+        logger.info(f"已保存 {len(cookies)} 个cookies到 {self.cookies_file}")
+        return True
+
+    def _read_cookies_file(self) -> List[Dict]:
+        """读取cookies文件，文件不存在或无法解析时返回空列表"""
+        if not self.cookies_file.exists():
+            return []
+        try:
+            with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取cookies失败: {str(e)}")
+            return []
+
+    async def _live_cookies(self) -> List[Dict]:
+        """HTTP会话和已打开页面中的cookies，只读取不导航"""
+        cookies = self.transport.export_cookies() if self.transport else []
+        if self.pool.started:
+            async with self.pool.lease() as tab:
+                cookies.extend(await tab.cookies(*[self._url(url) for url in COOKIE_URLS]))
+        return cookies
+
+    async def check_session(self, verify: bool = False) -> Dict:
+        """检查登录会话，不导航页面
+        
+        合并cookies文件、HTTP会话和已打开页面中的cookies，检查登录cookie是否存在、是否过期。
+        ``verify=True`` 且cookies显示已登录时再通过传输层发一次HTTP请求，确认服务端仍认可该会话：
+        能直连用户信息接口（配置了签名器）时请求用户信息，否则带着会话cookies请求未读消息接口。
+        没有传输层时跳过确认并记录警告，不会打开浏览器页面。
+        
+        Args:
+            verify: 是否请求用户信息确认
             
+        Returns:
+            Dict: ``logged_in`` 是否已登录，``expires_at``/``expires_in`` 登录cookie最早的过期时间戳
+            及剩余秒数（会话cookie为None），``verified`` 确认成功为True、认证失败为False、未确认为None
+            
+        Raises:
+            CSDNAPIError: 确认请求因认证以外的原因失败时抛出
+        """
+        state = login_state(merge_cookies(self._read_cookies_file(), await self._live_cookies()))
+        state['verified'] = None
+        if verify and state['logged_in']:
+            state['verified'] = await self._verify_session()
+            if state['verified'] is not None:
+                state['logged_in'] = state['verified']
+        return state
+
+    async def _verify_session(self) -> Optional[bool]:
+        """用一次HTTP请求确认服务端仍认可会话，不经过浏览器
+
+        Returns:
+            Optional[bool]: 认可为True，认证失败为False，没有传输层、无法确认时为None
+        """
+        if self.transport is None:
+            logger.warning("未启用HTTP直连，跳过会话确认")
+            return None
+        try:
+            if self.transport.supports(USER_INFO_URL):
+                user_info = await self._limited(
+                    'user_info', BIZAPI_HOST, 'http', lambda: self.transport.get_json(self._url(USER_INFO_URL)))
+                self._remember_identity(user_info)
+                return bool(((user_info or {}).get('data') or {}).get('basic'))
+            # 未读消息接口只需要会话cookies，不需要签名
+            await self._limited(
+                'unread_message', MSG_HOST, 'http', lambda: self.transport.get_json(self._url(UNREAD_MESSAGE_URL)))
+            return True
+        except CSDNAuthError:
+            return False
+        except CSDNBlockedError as e:
+            logger.warning(f"会话确认被拦截，无法确认: {str(e)}")
+            return None
+
+    def start_keepalive(self, interval: float = 600, refresh_before: float = 86400) -> asyncio.Task:
+        """启动后台保活任务
+        
+        每隔 ``interval`` 秒检查一次登录cookie。距过期不足 ``refresh_before`` 秒
+        （或登录cookie是会话cookie）时通过 ``check_session(verify=True)`` 发一次HTTP请求刷新会话，
+        并把服务端续期后的cookies写回文件，不会打开浏览器页面。
+        登录已失效时记录错误日志。重复调用返回已在运行的任务。
+        
+        Args:
+            interval: 检查间隔（秒）
+            refresh_before: 提前多少秒刷新
+            
+        Returns:
+            asyncio.Task: 保活任务，关闭客户端时自动取消
+        """
+        if self._keepalive is None or self._keepalive.done():
+            self._keepalive = asyncio.ensure_future(self._keep_alive(interval, refresh_before))
+        return self._keepalive
+
+    async def stop_keepalive(self):
+        """停止后台保活任务"""
+        task, self._keepalive = self._keepalive, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _keep_alive(self, interval: float, refresh_before: float):
+        """保活循环"""
+        while True:
+            delay = interval
+            try:
+                state = await self.check_session()
+                expires_in = state['expires_in']
+                if not state['logged_in']:
+                    logger.error("登录已失效，请重新登录")
+                elif expires_in is None or expires_in < refresh_before:
+                    state = await self.check_session(verify=True)
+                    if state['verified'] is None:
+                        logger.warning("无法确认会话，跳过本次刷新")
+                    elif state['verified']:
+                        await self.save_cookies()
+                        state = await self.check_session()
+                        logger.info(f"已刷新会话，登录cookie剩余 {_format_remaining(state['expires_in'])}")
+                    else:
+                        logger.error("会话刷新失败，登录已失效，请重新登录")
+                else:
+                    # 在进入刷新窗口时及时醒来
+                    delay = min(interval, expires_in - refresh_before)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"会话保活失败: {str(e)}")
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _lease(self, endpoint: str):
+        """从页面池租用页面，并记录等待空闲页面的耗时"""
+        start = time.perf_counter()
+        async with self.pool.lease() as tab:
+            self.metrics.observe(endpoint, 'lease', time.perf_counter() - start)
+            yield tab
+
+    async def _limited(self, endpoint: str, host: str, phase: str, func):
+        """在限流下执行请求，分别记录等待令牌和请求本身的耗时"""
+        if phase == 'http' and not self.transport.rate_limited:
+            # 回放等不产生真实请求的传输层不需要限流
+            with self.metrics.span(endpoint, phase):
+                return await func()
+        with self.metrics.span(endpoint, 'rate_limit'):
+            await self.limiter.acquire(host)
+        with self.metrics.span(endpoint, phase):
+            return await self.limiter.call(host, func, acquire=False)
+
+    async def _timed(self, endpoint: str, phase: str, awaitable):
+        """等待协程并记录耗时"""
+        with self.metrics.span(endpoint, phase):
+            return await awaitable
+
+    def _direct(self, url: str) -> bool:
+        """页面接口是否可以由传输层直接请求，不经过浏览器
+
+        Raises:
+            CSDNAPIError: 传输层不能直接请求且不允许回退到浏览器时抛出（如磁带中没有该接口的记录）
+        """
+        if self.transport is None:
+            return False
+        if self.transport.supports(url):
+            return True
+        if not self.transport.browser_fallback:
+            raise CSDNAPIError(f"传输层无法直接请求且不允许回退到浏览器: {url}")
+        return False
+
+    def _record(self, url: str, params: Optional[Dict], response_data: Dict):
+        """配置了录制器时把响应写入磁带，地址使用url_map替换前的原始地址"""
+        if self.recorder is not None:
+            self.recorder.record(url, response_data, params=params)
+
+    @instrument('user_info')
     async def get_user_info(self) -> Dict:
         """获取用户基本信息
         
@@ -76,51 +467,70 @@ class CSDNClient:
             CSDNAuthError: 认证失败时抛出
             CSDNAPIError: API调用失败时抛出
         """
-        await self.init()
-        
+        response_data = None
         try:
-            logger.info("正在获取用户信息...")
-            
-            # 先访问页面
-            await self.page.goto('https://i.csdn.net/#/user-center/profile')
-            await asyncio.sleep(2)  # 等待页面基本加载
-            
-            # 创建一个Future对象来存储响应
-            response_future = asyncio.Future()
-            
-            def handle_response(response):
-                asyncio.ensure_future(process_response(response))
+            # 传输层能直接请求时（配置了签名器或回放）不经过浏览器，签名被拒绝时回退到浏览器
+            if self._direct(USER_INFO_URL):
+                logger.info("正在获取用户信息...")
+                try:
+                    response_data = await self._limited(
+                        'user_info', BIZAPI_HOST, 'http', lambda: self.transport.get_json(self._url(USER_INFO_URL)))
+                except (CSDNAuthError, CSDNBlockedError) as e:
+                    if not self.transport.browser_fallback:
+                        raise
+                    logger.warning(f"HTTP直连失败，回退到浏览器: {str(e)}")
+            if response_data is None:
+                await self.init()
+                async with self._lease('user_info') as tab:
+                    logger.info("正在获取用户信息...")
                 
-            async def process_response(response):
-                if response.url == 'https://bizapi.csdn.net/community-personal/v1/get-personal-info':
+                    # 先安装响应匹配器再导航，接口数据到达后立即返回
                     try:
-                        json_data = await response.json()
-                        if not response_future.done():
-                            response_future.set_result(json_data)
-                    except Exception as e:
-                        if not response_future.done():
-                            response_future.set_exception(e)
-                        
-            # 监听响应
-            self.page.on('response', handle_response)
-            
-            # 刷新页面触发API请求
-            await self.page.reload()
-            
-            # 等待响应数据或超时
-            try:
-                response_data = await asyncio.wait_for(response_future, timeout=5.0)
-                logger.info(f"获取用户信息成功: {response_data}")
-                return response_data
-            except asyncio.TimeoutError:
-                raise CSDNAPIError("获取用户信息超时")
+                        response_data = await self._limited('user_info', BIZAPI_HOST, 'capture', lambda: capture_response(
+                            tab,
+                            self._patterns['user_info'],
+                            lambda: self._timed('user_info', 'navigate', navigate(tab, self._url(PROFILE_PAGE_URL))),
+                            timeout=10.0
+                        ))
+                    except asyncio.TimeoutError:
+                        raise CSDNTimeoutError("获取用户信息超时")
+            log_payload("获取用户信息成功", response_data)
+            self._record(USER_INFO_URL, None, response_data)
+            self._remember_identity(response_data)
+            return response_data
             
         except Exception as e:
-            if isinstance(e, CSDNAuthError):
+            if isinstance(e, (CSDNAuthError, CSDNRateLimitError, CSDNTimeoutError)):
                 raise
             logger.error(f"获取用户信息失败: {str(e)}")
             raise CSDNAPIError(f"API调用失败: {str(e)}")
             
+    def _remember_identity(self, user_info: Dict):
+        """从用户信息响应中缓存用户ID"""
+        try:
+            self.identity.set(user_info['data']['basic']['id'])
+        except (KeyError, TypeError):
+            pass
+
+    async def get_user_id(self) -> str:
+        """获取当前登录用户的ID，优先使用缓存
+        
+        Returns:
+            str: 用户ID
+            
+        Raises:
+            CSDNAPIError: 无法获取用户信息时抛出
+        """
+        user_id = self.identity.get()
+        if user_id:
+            return user_id
+
+        user_info = await self.get_user_info()
+        if not user_info or 'data' not in user_info or 'basic' not in user_info['data']:
+            raise CSDNAPIError("无法获取用户信息")
+        return user_info['data']['basic']['id']
+
+    @instrument('unread_message')
     async def get_unread_message_count(self) -> Dict:
         """获取未读消息数量
         
@@ -131,72 +541,49 @@ class CSDNClient:
             CSDNAuthError: 认证失败时抛出
             CSDNAPIError: API调用失败时抛出
         """
-        await self.init()
+        direct = self._direct(UNREAD_MESSAGE_URL)
+        if not direct:
+            await self.init()
         
         try:
-            logger.info("正在获取未读消息数量...")
-            
-            # 先访问页面
-            await self.page.goto('https://i.csdn.net/#/msg/index')
-            await asyncio.sleep(2)  # 等待页面基本加载
-            
-            # 创建一个Future对象来存储响应
-            response_future = asyncio.Future()
-            
-            def handle_response(response):
-                asyncio.ensure_future(process_response(response))
+            if direct:
+                logger.info("正在获取未读消息数量...")
+                response_data = await self._limited(
+                    'unread_message', MSG_HOST, 'http', lambda: self.transport.get_json(self._url(UNREAD_MESSAGE_URL)))
+            else:
+                async with self._lease('unread_message') as tab:
+                    logger.info("正在获取未读消息数量...")
                 
-            async def process_response(response):
-                if response.url == 'https://msg.csdn.net/v1/web/message/view/unread':
+                    # 先安装响应匹配器再导航，接口数据到达后立即返回
                     try:
-                        json_data = await response.json()
-                        if not response_future.done():
-                            response_future.set_result(json_data)
-                    except Exception as e:
-                        if not response_future.done():
-                            response_future.set_exception(e)
-                        
-            # 监听响应
-            self.page.on('response', handle_response)
-            
-            # 刷新页面触发API请求
-            await self.page.reload()
-            
-            # 等待响应数据或超时
-            try:
-                response_data = await asyncio.wait_for(response_future, timeout=5.0)
-                logger.info(f"获取未读消息数量成功: {response_data}")
-                return response_data
-            except asyncio.TimeoutError:
-                raise CSDNAPIError("获取未读消息数量超时")
+                        response_data = await self._limited('unread_message', MSG_HOST, 'capture', lambda: capture_response(
+                            tab,
+                            self._patterns['unread_message'],
+                            lambda: self._timed('unread_message', 'navigate', navigate(tab, self._url(MESSAGE_PAGE_URL))),
+                            timeout=10.0
+                        ))
+                    except asyncio.TimeoutError:
+                        raise CSDNTimeoutError("获取未读消息数量超时")
+            log_payload("获取未读消息数量成功", response_data)
+            self._record(UNREAD_MESSAGE_URL, None, response_data)
+            return response_data
             
         except Exception as e:
-            if isinstance(e, CSDNAuthError):
+            if isinstance(e, (CSDNAuthError, CSDNRateLimitError, CSDNTimeoutError)):
                 raise
             logger.error(f"获取未读消息数量失败: {str(e)}")
             raise CSDNAPIError(f"API调用失败: {str(e)}")
 
     async def check_login_status(self) -> bool:
-        """检查登录状态
+        """检查登录状态，只检查登录cookie是否存在且未过期，不导航页面
+        
+        需要确认服务端是否认可会话时使用 ``check_session(verify=True)``。
         
         Returns:
             bool: 是否已登录
         """
         try:
-            await self.init()
-            await self.page.goto('https://i.csdn.net/')
-            await asyncio.sleep(2)
-            
-            current_url = self.page.url
-            if 'passport.csdn.net/login' in current_url:
-                return False
-                
-            cookies = await self.page.cookies()
-            important_cookies = ['UserName', 'UserToken', 'uuid_tt_dd']
-            found_cookies = [cookie['name'] for cookie in cookies]
-            
-            return any(cookie in found_cookies for cookie in important_cookies)
-            
+            return (await self.check_session())['logged_in']
         except Exception as e:
             logger.error(f"检查登录状态失败: {str(e)}")
             return False 
@@ -216,85 +603,158 @@ class CSDNClient:
             CSDNAuthError: 认证失败时抛出
             CSDNAPIError: API调用失败时抛出
         """
-        await self.init()
+        if self.cache:
+            params = {'account': str(self.cookies_file), 'page': page, 'size': size, 'status': status}
+            return await self.cache.fetch(
+                'article_list', params, lambda: self._fetch_article_list(page, size, status))
+        return await self._fetch_article_list(page, size, status)
+
+    async def iter_articles(self, status: str = "all", page_size: int = 20,
+                            prefetch: int = 2) -> AsyncIterator[Dict]:
+        """逐篇遍历全部文章
         
-        try:
-            logger.info(f"正在获取文章列表... 第{page}页，每页{size}条，状态：{status}")
-            
-            # 先获取用户信息
-            user_info = await self.get_user_info()
-            if not user_info or 'data' not in user_info or 'basic' not in user_info['data']:
-                raise CSDNAPIError("无法获取用户信息")
-            
-            user_id = user_info['data']['basic']['id']
-            
-            # 先访问博客主页
-            blog_url = f'https://blog.csdn.net/{user_id}'
-            logger.info(f"访问博客主页: {blog_url}")
-            await self.page.goto(blog_url)
-            await asyncio.sleep(2)  # 等待页面加载
-            
-            # 创建一个Future对象来存储响应
-            response_future = asyncio.Future()
-            
-            def handle_response(response):
-                asyncio.ensure_future(process_response(response))
-                
-            async def process_response(response):
-                if 'get-business-list' in response.url:
-                    try:
-                        json_data = await response.json()
-                        if not response_future.done():
-                            response_future.set_result(json_data)
-                    except Exception as e:
-                        logger.error(f"解析响应失败: {str(e)}")
-                        try:
-                            text = await response.text()
-                            logger.error(f"响应内容: {text}")
-                        except:
-                            pass
-                        if not response_future.done():
-                            response_future.set_exception(e)
+        先单独请求第一页，按其中的总数算出总页数后，在返回当前页文章的同时并发预取后续 ``prefetch`` 页，
+        不会请求超出总页数的页。接口返回的列表为空、不足一页或已达到总数时停止，
+        内存中最多保留 ``prefetch + 1`` 页。
+        
+        Args:
+            status: 文章状态，可选值：all（全部）、published（已发布）、draft（草稿）
+            page_size: 每页数量
+            prefetch: 预取的页数
             
-            # 监听响应
-            self.page.on('response', handle_response)
+        Yields:
+            Dict: 单篇文章数据
             
-            # 使用evaluate执行API请求
-            logger.info("执行API请求...")
-            await self.page.evaluate(f'''async () => {{
-                const response = await fetch('https://blog.csdn.net/community/home-api/v1/get-business-list?page={page}&size={size}&businessType=blog&orderby=&noMore=false&year=&month=&username={user_id}', {{
-                    method: 'GET',
-                    headers: {{
-                        'accept': 'application/json, text/plain, */*',
-                        'referer': '{blog_url}',
-                        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                    }},
-                    credentials: 'include'
-                }});
-                return response.json();
-            }}''')
+        Raises:
+            CSDNAuthError: 认证失败时抛出
+            CSDNAPIError: API调用失败时抛出
+        """
+        pending = deque()
+        next_page = 1
+        last_page = None
+
+        def schedule():
+            nonlocal next_page
+            if last_page is not None and next_page > last_page:
+                return False
+            task = asyncio.ensure_future(self.get_article_list(page=next_page, size=page_size, status=status))
+            # 提前结束时取消的预取请求可能已经失败，取走异常避免"Task exception was never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            pending.append(task)
+            next_page += 1
+            return True
+
+        try:
+            # 第一页返回总数之前不预取，避免文章少时请求多余的页
+            schedule()
+
+            seen = 0
+            while pending:
+                response = await pending.popleft()
+                data = (response or {}).get('data') or {}
+                articles = data.get('list') or []
+                total = data.get('total')
+                seen += len(articles)
+
+                if total is not None:
+                    last_page = -(-int(total) // page_size)
+                finished = (not articles or len(articles) < page_size or data.get('noMore')
+                            or (total is not None and seen >= int(total)))
+                if finished:
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                else:
+                    while len(pending) < prefetch + 1 and schedule():
+                        pass
+
+                for article in articles:
+                    yield article
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @instrument('article_list')
+    async def _fetch_article_list(self, page: int, size: int, status: str) -> Dict:
+        """请求文章列表，不经过缓存"""
+        try:
+            logger.info(f"正在获取文章列表... 第{page}页，每页{size}条，状态：{status}")
             
-            # 等待响应数据或超时
-            try:
-                response_data = await asyncio.wait_for(response_future, timeout=10.0)
-                logger.info(f"获取文章列表成功: {response_data}")
-                return response_data
-            except asyncio.TimeoutError:
-                raise CSDNAPIError("获取文章列表超时")
+            # 先获取用户ID，命中缓存时无需访问个人资料页
+            user_id = await self.get_user_id()
+            blog_url = self._url(f'{BLOG_HOME_URL}{user_id}')
+            params = {
+                'page': page, 'size': size, 'businessType': 'blog', 'orderby': '',
+                'noMore': 'false', 'year': '', 'month': '', 'username': user_id
+            }
+
+            # 优先走HTTP直连，认证失败或被拦截时回退到浏览器
+            if self.transport:
+                try:
+                    response_data = await self._limited('article_list', BLOG_HOST, 'http', lambda: self.transport.get_json(
+                        self._url(BUSINESS_LIST_URL), params=params, headers={'referer': blog_url}))
+                    log_payload("获取文章列表成功", response_data)
+                    self._record(BUSINESS_LIST_URL, params, response_data)
+                    return response_data
+                except (CSDNAuthError, CSDNBlockedError) as e:
+                    if isinstance(e, CSDNAuthError):
+                        self.identity.invalidate()
+                    if not self.transport.browser_fallback:
+                        raise
+                    logger.warning(f"HTTP直连失败，回退到浏览器: {str(e)}")
+
+            await self.init()
+            async with self._lease('article_list') as tab:
+                # 页面需要停留在博客域名下才能携带cookies发起fetch
+                if not tab.url.startswith(self._url(BLOG_HOME_URL)):
+                    logger.info(f"访问博客主页: {blog_url}")
+                    with self.metrics.span('article_list', 'goto'):
+                        await tab.goto(blog_url, waitUntil='domcontentloaded')
+            
+                # 在页面中发起请求，不等待其完成，由响应匹配器捕获结果
+                logger.info("执行API请求...")
+                fetch_script = f'''() => {{
+                    fetch('{self._url(BUSINESS_LIST_URL)}?{urlencode(params)}', {{
+                        method: 'GET',
+                        headers: {{
+                            'accept': 'application/json, text/plain, */*',
+                            'referer': '{blog_url}'
+                        }},
+                        credentials: 'include'
+                    }});
+                }}'''
+                try:
+                    response_data = await self._limited('article_list', BLOG_HOST, 'capture', lambda: capture_response(
+                        tab,
+                        self._patterns['business_list'],
+                        lambda: tab.evaluate(fetch_script),
+                        timeout=10.0
+                    ))
+                    log_payload("获取文章列表成功", response_data)
+                    self._record(BUSINESS_LIST_URL, params, response_data)
+                    return response_data
+                except asyncio.TimeoutError:
+                    raise CSDNTimeoutError("获取文章列表超时")
             
         except Exception as e:
             if isinstance(e, CSDNAuthError):
+                self.identity.invalidate()
+                raise
+            if isinstance(e, (CSDNRateLimitError, CSDNTimeoutError)):
                 raise
             logger.error(f"获取文章列表失败: {str(e)}")
             raise CSDNAPIError(f"API调用失败: {str(e)}")
 
-    async def search(self, keyword: str, page: int = 1, scope: str = "all") -> Dict:
+    async def search(self, keyword: str, page: int = 1, scope: str = "all",
+                     local_first: bool = False) -> Dict:
         """搜索CSDN内容
         
         Args:
             keyword: 搜索关键词
             page: 页码，从1开始
             scope: 搜索范围，默认为all
+            local_first: 是否先查本地搜索索引，有包含全部关键词的结果时直接返回（带 ``'source': 'local'``），
+                不区分搜索范围；没有时再在线搜索
             
         Returns:
             Dict: 搜索结果
@@ -302,52 +762,156 @@ class CSDNClient:
         Raises:
             CSDNAPIError: API调用失败时抛出
         """
-        await self.init()
-        
+        if local_first and self.search_index is not None:
+            hits = self.search_index.query(
+                keyword, limit=LOCAL_PAGE_SIZE, offset=(page - 1) * LOCAL_PAGE_SIZE, match_all=True)
+            if hits:
+                return {'code': 200, 'result_vos': hits, 'source': 'local'}
+
+        if self.cache:
+            params = {'keyword': keyword, 'page': page, 'scope': scope}
+            response = await self.cache.fetch(
+                'search', params, lambda: self._search(keyword, page, scope))
+        else:
+            response = await self._search(keyword, page, scope)
+        if self.search_index is not None:
+            self.search_index.ingest(response)
+        return response
+
+    @instrument('search')
+    async def _search(self, keyword: str, page: int, scope: str) -> Dict:
+        """发起搜索请求，不经过缓存"""
         try:
             logger.info(f"正在搜索... 关键词: {keyword}, 第{page}页")
+            params = build_search_params(keyword, page, scope)
+
+            # 优先走HTTP直连，被拦截时回退到浏览器
+            if self.transport:
+                try:
+                    response_data = await self._limited(
+                        'search', SEARCH_HOST, 'http',
+                        lambda: self.transport.get_json(self._url(SEARCH_API_URL), params=params))
+                    log_payload("搜索完成", response_data)
+                    self._record(SEARCH_API_URL, params, response_data)
+                    return response_data
+                except (CSDNAuthError, CSDNBlockedError) as e:
+                    if not self.transport.browser_fallback:
+                        raise
+                    logger.warning(f"HTTP直连失败，回退到浏览器: {str(e)}")
+
+            await self.init()
+            async with self._lease('search') as tab:
+                # 访问搜索页面以触发API请求
+                search_url = self._url(SEARCH_PAGE_URL) + '?' + urlencode({'q': keyword, 't': scope, 'p': page})
+                logger.info(f"访问搜索页面: {search_url}")
+                try:
+                    response_data = await self._limited('search', SEARCH_HOST, 'capture', lambda: capture_response(
+                        tab,
+                        self._patterns['search'],
+                        lambda: self._timed('search', 'navigate', navigate(tab, search_url)),
+                        timeout=10.0
+                    ))
+                    log_payload("搜索完成", response_data)
+                    self._record(SEARCH_API_URL, params, response_data)
+                    return response_data
+                except asyncio.TimeoutError:
+                    raise CSDNTimeoutError("搜索请求超时")
             
-            # 创建一个Future对象来存储响应
-            response_future = asyncio.Future()
-            
-            def handle_response(response):
-                asyncio.ensure_future(process_response(response))
-                
-            async def process_response(response):
-                if 'so.csdn.net/api/v3/search' in response.url:
-                    try:
-                        json_data = await response.json()
-                        if not response_future.done():
-                            response_future.set_result(json_data)
-                    except Exception as e:
-                        logger.error(f"解析响应失败: {str(e)}")
-                        try:
-                            text = await response.text()
-                            logger.error(f"响应内容: {text}")
-                        except:
-                            pass
-                        if not response_future.done():
-                            response_future.set_exception(e)
-            
-            # 监听响应
-            self.page.on('response', handle_response)
-            
-            # 构建API URL
-            api_url = f'https://so.csdn.net/api/v3/search?q={keyword}&t={scope}&p={page}&s=0&tm=0&lv=-1&ft=0&l=&u=&ct=-1&pnt=-1&ry=-1&ss=-1&dct=-1&vco=-1&cc=-1&sc=-1&akt=-1&art=-1&ca=-1&prs=&pre=&ecc=-1&ebc=-1&ia=1&platform=pc'
+        except Exception as e:
+            if isinstance(e, (CSDNAuthError, CSDNBlockedError, CSDNRateLimitError, CSDNTimeoutError)):
+                raise
+            logger.error(f"搜索失败: {str(e)}")
+            raise CSDNAPIError(f"搜索失败: {str(e)}")
+
+    async def search_many(self, keywords: Iterable[str], pages: int = 1, scope: str = "all",
+                          concurrency: int = 8,
+                          on_error: Callable[[str, int, CSDNError], None] = None
+                          ) -> AsyncIterator[Tuple[str, int, Dict]]:
+        """批量搜索多个关键词的多页结果
+        
+        (关键词, 页码) 组合按页码优先的顺序分配给 ``concurrency`` 个并发任务，
+        某个关键词的某一页没有结果时不再请求它的后续页。
+        同一关键词在不同页中重复出现的结果按URL/ID去重，结果在各页完成时立即返回。
+        
+        单页请求失败时记录日志并调用 ``on_error``，继续其余请求；
+        认证失败或被反爬拦截时后续请求同样会失败，此时不再发起新请求，
+        已完成的结果返回后抛出该异常。
+        
+        Args:
+            keywords: 搜索关键词列表
+            pages: 每个关键词搜索的页数
+            scope: 搜索范围，默认为all
+            concurrency: 最大并发请求数
+            on_error: 单页请求失败时的回调，参数为 (关键词, 页码, 异常)
             
-            # 访问搜索页面以触发API请求
-            logger.info(f"访问搜索页面: {api_url}")
-            await self.page.goto(f'https://so.csdn.net/so/search?q={keyword}&t={scope}&p={page}')
-            await asyncio.sleep(2)  # 等待页面加载
+        Yields:
+            Tuple[str, int, Dict]: (关键词, 页码, 单条搜索结果)
             
-            # 等待响应数据或超时
+        Raises:
+            CSDNAuthError: 认证失败时抛出
+            CSDNBlockedError: 触发反爬验证时抛出
+        """
+        keywords = list(dict.fromkeys(keywords))
+        jobs = asyncio.Queue()
+        for page in range(1, pages + 1):
+            for keyword in keywords:
+                jobs.put_nowait((keyword, page))
+
+        results = asyncio.Queue(maxsize=concurrency)
+        exhausted = set()
+        fatal: List[CSDNError] = []
+
+        async def worker():
+            while not jobs.empty():
+                keyword, page = jobs.get_nowait()
+                if keyword in exhausted:
+                    continue
+                try:
+                    response = await self.search(keyword, page=page, scope=scope)
+                except (CSDNAuthError, CSDNBlockedError) as e:
+                    logger.error(f"批量搜索中止: {keyword} 第{page}页: {str(e)}")
+                    fatal.append(e)
+                    # 丢弃尚未开始的请求
+                    while not jobs.empty():
+                        jobs.get_nowait()
+                    return
+                except CSDNError as e:
+                    logger.error(f"批量搜索失败: {keyword} 第{page}页: {str(e)}")
+                    if on_error is not None:
+                        on_error(keyword, page, e)
+                    continue
+                items = (response or {}).get('result_vos') or []
+                if not items:
+                    exhausted.add(keyword)
+                await results.put((keyword, page, items))
+
+        async def supervise():
             try:
-                response_data = await asyncio.wait_for(response_future, timeout=10.0)
-                logger.info(f"搜索完成，获取到响应数据")
-                return response_data
-            except asyncio.TimeoutError:
-                raise CSDNAPIError("搜索请求超时")
-            
-        except Exception as e:
-            logger.error(f"搜索失败: {str(e)}")
-            raise CSDNAPIError(f"搜索失败: {str(e)}") 
\ No newline at end of file
+                await asyncio.gather(*workers)
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.ensure_future(worker())
+                   for _ in range(max(1, min(concurrency, jobs.qsize())))]
+        supervisor = asyncio.ensure_future(supervise())
+        seen: Dict[str, set] = {}
+        try:
+            while True:
+                batch = await results.get()
+                if batch is None:
+                    break
+                keyword, page, items = batch
+                keys = seen.setdefault(keyword, set())
+                for item in items:
+                    key = item.get('url') or item.get('id') or json.dumps(item, sort_keys=True)
+                    if key in keys:
+                        continue
+                    keys.add(key)
+                    yield keyword, page, item
+            await supervisor
+            if fatal:
+                raise fatal[0]
+        finally:
+            for task in workers:
+                task.cancel()
+            supervisor.cancel()
@@ -5,10 +5,22 @@
 import os
 import json
 from pathlib import Path
+from typing import Optional, Tuple
 
 # 默认Chrome路径
 DEFAULT_CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
 
+def _get_config_value(key: str) -> Optional[str]:
+    """读取config.json中的配置项，文件不存在或无法解析时返回None"""
+    config_file = Path("config.json")
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get(key)
+        except:
+            pass
+    return None
+
 def get_chrome_path() -> str:
     """获取Chrome浏览器路径
     
@@ -23,15 +35,65 @@ def get_chrome_path() -> str:
         return chrome_path
         
     # 2. 检查配置文件
-    config_file = Path("config.json")
-    if config_file.exists():
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                if 'chrome_path' in config:
-                    return config['chrome_path']
-        except:
-            pass
+    chrome_path = _get_config_value('chrome_path')
+    if chrome_path:
+        return chrome_path
             
     # 3. 使用默认路径
-    return DEFAULT_CHROME_PATH 
\ No newline at end of file
+    return DEFAULT_CHROME_PATH
+
+def get_browser_endpoint() -> Optional[str]:
+    """获取已运行Chrome的调试地址
+    
+    可以是 ``ws://host:port/devtools/browser/<id>`` 形式的websocket地址，
+    也可以是 ``http://host:port`` 形式的调试端口地址。
+    
+    优先级：
+    1. 环境变量 CHROME_ENDPOINT
+    2. config.json中的browser_endpoint
+    """
+    return os.getenv('CHROME_ENDPOINT') or _get_config_value('browser_endpoint')
+
+def get_user_data_dir() -> Optional[str]:
+    """获取持久化的Chrome用户数据目录
+    
+    优先级：
+    1. 环境变量 CHROME_USER_DATA_DIR
+    2. config.json中的user_data_dir
+    """
+    return os.getenv('CHROME_USER_DATA_DIR') or _get_config_value('user_data_dir')
+
+def get_profiles_dir() -> str:
+    """获取多账号cookies配置目录，目录下每个 ``<账号名>.json`` 是一个账号的cookies
+    
+    优先级：
+    1. 环境变量 CSDN_PROFILES_DIR
+    2. config.json中的profiles_dir
+    3. 默认目录 profiles
+    """
+    return os.getenv('CSDN_PROFILES_DIR') or _get_config_value('profiles_dir') or 'profiles'
+
+def get_log_settings() -> dict:
+    """获取日志配置
+    
+    - level: 日志级别，环境变量 CSDN_LOG_LEVEL 优先，其次为config.json中的log_level
+    - payload_chars: 单条日志中响应数据的最大字符数，config.json中的log_payload_chars
+    - payload_level: 输出响应数据的日志级别，config.json中的log_payload_level
+    """
+    return {
+        'level': os.getenv('CSDN_LOG_LEVEL') or _get_config_value('log_level'),
+        'payload_chars': _get_config_value('log_payload_chars'),
+        'payload_level': _get_config_value('log_payload_level'),
+    }
+
+def get_bizapi_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """获取bizapi请求签名使用的AppKey和AppSecret
+    
+    AppKey即抓包得到的 ``x-ca-key``，AppSecret需要从网页脚本中获得，两者都配置后才能直连签名接口。
+    
+    优先级：
+    1. 环境变量 CSDN_BIZAPI_KEY / CSDN_BIZAPI_SECRET
+    2. config.json中的bizapi_key / bizapi_secret
+    """
+    return (os.getenv('CSDN_BIZAPI_KEY') or _get_config_value('bizapi_key'),
+            os.getenv('CSDN_BIZAPI_SECRET') or _get_config_value('bizapi_secret'))
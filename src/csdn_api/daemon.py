@@ -0,0 +1,154 @@
+"""
+CSDN 客户端守护进程
+常驻一个已启动浏览器的 CSDNClient，通过本地套接字以JSON对外提供接口，
+多个短生命周期的进程可以共享同一个浏览器会话及其缓存
+"""
+
+import json
+import asyncio
+import argparse
+from typing import Dict
+from loguru import logger
+from src.csdn_api.client import CSDNClient
+from src.csdn_api.cache import ResponseCache
+from src.csdn_api.logs import configure_logging
+from src.csdn_api.daemon_client import DEFAULT_HOST, DEFAULT_PORT, STREAM_LIMIT
+
+# 对外开放的客户端方法
+METHODS = frozenset({
+    'get_user_info',
+    'get_unread_message_count',
+    'get_article_list',
+    'search',
+    'check_session',
+})
+
+
+class CSDNDaemon:
+    """守护进程服务端
+
+    协议为每行一个JSON：请求 ``{"id": 1, "method": "search", "params": {...}}``，
+    响应 ``{"id": 1, "result": ...}`` 或 ``{"id": 1, "error": {"type": ..., "message": ...}}``。
+    同一连接上的请求并发执行，响应顺序与完成顺序一致。
+    方法名 ``metrics`` 返回客户端的指标快照。
+    """
+
+    def __init__(self, client: CSDNClient, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, path: str = None, keepalive: float = None):
+        """初始化守护进程
+
+        Args:
+            client: 常驻的CSDN客户端
+            host: 监听地址，只应使用本机地址
+            port: 监听端口
+            path: Unix套接字路径，指定后忽略host和port
+            keepalive: 会话保活的检查间隔（秒），为None时不启动保活任务
+        """
+        self.client = client
+        self.host = host
+        self.port = port
+        self.path = path
+        self.keepalive = keepalive
+        self._server = None
+
+    async def start(self):
+        """启动浏览器并开始监听"""
+        await self.client.init()
+        if self.keepalive:
+            self.client.start_keepalive(interval=self.keepalive)
+        if self.path:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, self.path, limit=STREAM_LIMIT)
+            logger.info(f"守护进程已启动: {self.path}")
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.host, self.port, limit=STREAM_LIMIT)
+            logger.info(f"守护进程已启动: {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        """启动并持续提供服务，退出时关闭客户端"""
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.client.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """处理一个连接上的全部请求"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._handle_request(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except Exception as e:
+            logger.error(f"读取请求失败: {str(e)}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        """执行单个请求并写回响应"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = {'id': request_id, 'result': await self._dispatch(request)}
+        except Exception as e:
+            response = {'id': request_id, 'error': {'type': type(e).__name__, 'message': str(e)}}
+
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+        async with write_lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def _dispatch(self, request: Dict):
+        """调用客户端方法"""
+        method = request.get('method')
+        if method == 'metrics':
+            return self.client.metrics.snapshot()
+        if method not in METHODS:
+            raise ValueError(f"不支持的方法: {method}")
+        return await getattr(self.client, method)(**(request.get('params') or {}))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="CSDN 客户端守护进程")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="监听地址")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="监听端口")
+    parser.add_argument('--socket', help="Unix套接字路径，指定后不再监听TCP端口")
+    parser.add_argument('--cookies', help="cookies文件路径")
+    parser.add_argument('--pool-size', type=int, default=4, help="页面池大小")
+    parser.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                        help="启用响应缓存，可选指定SQLite文件路径")
+    parser.add_argument('--keepalive', type=float, metavar='SECONDS',
+                        help="每隔多少秒检查一次登录cookie，临近过期时自动刷新会话")
+    args = parser.parse_args()
+    configure_logging()
+
+    cache = ResponseCache(args.cache or None) if args.cache is not None else None
+    client = CSDNClient(cookies_file=args.cookies, pool_size=args.pool_size, cache=cache)
+    daemon = CSDNDaemon(client, host=args.host, port=args.port, path=args.socket,
+                        keepalive=args.keepalive)
+
+    # 使用新的事件循环
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(daemon.serve_forever())
+    except KeyboardInterrupt:
+        loop.run_until_complete(client.close())
+        logger.info("守护进程已停止")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
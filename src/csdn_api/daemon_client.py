@@ -0,0 +1,144 @@
+"""
+CSDN 守护进程客户端
+通过本地套接字调用守护进程中常驻的 CSDNClient，无需启动浏览器
+"""
+
+import json
+import asyncio
+import itertools
+from typing import Dict, Optional
+from src.csdn_api import exceptions
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 单行消息的最大长度，文章列表等响应可能较大
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class DaemonClient:
+    """守护进程客户端
+
+    与守护进程保持一条长连接，请求按行发送JSON，
+    多个并发请求通过 ``id`` 复用同一连接。
+    守护进程返回的错误会还原为 :mod:`exceptions` 中对应的异常类型。
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str = None):
+        """初始化客户端
+
+        Args:
+            host: 守护进程监听的地址
+            port: 守护进程监听的端口
+            path: Unix套接字路径，指定后忽略host和port
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def connect(self):
+        """连接守护进程"""
+        if self._writer is not None:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            if self.path:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=STREAM_LIMIT)
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+            self._reader, self._writer = reader, writer
+            self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    async def _read_responses(self):
+        """读取响应并交给对应的请求"""
+        error = exceptions.CSDNError("与守护进程的连接已断开")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(_to_exception(message['error']))
+                else:
+                    future.set_result(message.get('result'))
+        except Exception as e:
+            error = exceptions.CSDNError(f"读取守护进程响应失败: {str(e)}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+            self._writer = None
+
+    async def call(self, method: str, **params):
+        """调用守护进程中的客户端方法
+
+        Args:
+            method: 方法名
+            **params: 方法参数
+
+        Returns:
+            方法返回值
+        """
+        await self.connect()
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        payload = {'id': request_id, 'method': method, 'params': params}
+        self._writer.write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def get_user_info(self) -> Dict:
+        """获取用户基本信息"""
+        return await self.call('get_user_info')
+
+    async def get_unread_message_count(self) -> Dict:
+        """获取未读消息数量"""
+        return await self.call('get_unread_message_count')
+
+    async def get_article_list(self, page: int = 1, size: int = 20, status: str = "all") -> Dict:
+        """获取文章列表"""
+        return await self.call('get_article_list', page=page, size=size, status=status)
+
+    async def search(self, keyword: str, page: int = 1, scope: str = "all") -> Dict:
+        """搜索CSDN内容"""
+        return await self.call('search', keyword=keyword, page=page, scope=scope)
+
+    async def check_session(self, verify: bool = False) -> Dict:
+        """检查守护进程中客户端的登录会话"""
+        return await self.call('check_session', verify=verify)
+
+    async def metrics(self) -> Dict:
+        """获取守护进程中客户端的指标快照"""
+        return await self.call('metrics')
+
+    async def close(self):
+        """断开与守护进程的连接"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+
+
+def _to_exception(error: Dict) -> Exception:
+    """把守护进程返回的错误还原为异常"""
+    cls = getattr(exceptions, error.get('type', ''), None)
+    if not (isinstance(cls, type) and issubclass(cls, exceptions.CSDNError)):
+        cls = exceptions.CSDNError
+    return cls(error.get('message', ''))
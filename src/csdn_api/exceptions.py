@@ -23,4 +23,12 @@ class CSDNRateLimitError(CSDNError):
 
 class CSDNValidationError(CSDNError):
     """数据验证错误"""
-    pass 
\ No newline at end of file
+    pass 
+
+class CSDNBlockedError(CSDNError):
+    """请求被反爬策略拦截（验证码、WAF页面等）"""
+    pass
+
+class CSDNTimeoutError(CSDNAPIError):
+    """等待接口响应超时"""
+    pass
@@ -0,0 +1,137 @@
+"""
+文章批量导出
+逐页请求文章列表并直接写入压缩文件，每写完一页保存一次检查点，中断后从最后提交的一页继续
+
+每页写成一个独立的gzip成员追加到文件末尾，检查点记录提交后的文件长度。
+恢复时先把文件截断到该长度，丢弃未提交的半页数据，因此导出文件总是完整可读的，
+内存中只保留当前一页。
+"""
+
+import os
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+from loguru import logger
+from src.csdn_api.articles import NUMERIC_FIELDS, Article
+from src.csdn_api.exceptions import CSDNValidationError
+from src.csdn_api.utils import write_json_atomic
+
+# 导出格式：jsonl 每行一篇文章，保留接口返回的全部字段；columns 每行一页，按列存储 COLUMNS 中的字段
+FORMATS = ('jsonl', 'columns')
+
+# 按列导出时的列
+COLUMNS = ('article_id', 'title', 'url', 'description', 'type', *NUMERIC_FIELDS, 'publish_time')
+
+
+def checkpoint_path(path: Union[str, Path]) -> Path:
+    """导出文件对应的检查点文件"""
+    path = Path(path)
+    return path.with_name(path.name + '.checkpoint.json')
+
+
+def _encode_page(articles: List[Dict], fmt: str) -> bytes:
+    """把一页文章编码为一个gzip成员"""
+    if fmt == 'jsonl':
+        lines = [json.dumps(article, ensure_ascii=False) for article in articles]
+    else:
+        records = [Article.from_dict(article) for article in articles]
+        lines = [json.dumps({name: [getattr(record, name) for record in records] for name in COLUMNS},
+                            ensure_ascii=False)]
+    return gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+
+
+def _load_checkpoint(path: Path, params: Dict, restart: bool) -> Dict:
+    """读取检查点，参数不一致或导出文件比检查点记录的短时拒绝续传"""
+    checkpoint_file = checkpoint_path(path)
+    if restart or not checkpoint_file.exists():
+        return {**params, 'page': 0, 'offset': 0, 'count': 0, 'complete': False}
+    with open(checkpoint_file, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    for key, value in params.items():
+        if checkpoint.get(key) != value:
+            raise CSDNValidationError(
+                f"检查点参数 {key}={checkpoint.get(key)!r} 与本次导出 {value!r} 不一致，请使用restart重新导出")
+    # 导出文件被删除或截短时，按检查点截断会用零字节补齐，续传的结果无法使用
+    size = path.stat().st_size if path.exists() else 0
+    if size < checkpoint['offset']:
+        raise CSDNValidationError(
+            f"导出文件只有 {size} 字节，少于检查点记录的 {checkpoint['offset']} 字节，请使用restart重新导出")
+    return checkpoint
+
+
+async def export_articles(client, path: Union[str, Path], fmt: str = 'jsonl', status: str = "all",
+                          page_size: int = 20, restart: bool = False) -> Dict:
+    """导出全部文章，可断点续传
+
+    Args:
+        client: :class:`CSDNClient` 或其他提供 ``get_article_list`` 的客户端
+        path: 导出文件路径，建议以 ``.jsonl.gz`` 结尾
+        fmt: 导出格式，``jsonl`` 每行一篇文章，``columns`` 每行一页、按列存储
+        status: 文章状态，可选值：all（全部）、published（已发布）、draft（草稿）
+        page_size: 每页数量
+        restart: 忽略已有检查点，从头导出
+
+    Returns:
+        Dict: 检查点内容，包括已导出的页数 ``page``、文章数 ``count`` 和是否完成 ``complete``
+
+    Raises:
+        CSDNValidationError: 已有检查点的参数与本次不一致，或导出文件缺失、比检查点记录的短时抛出
+        CSDNAuthError: 认证失败时抛出
+        CSDNAPIError: API调用失败时抛出，已提交的页不受影响，再次调用即可继续
+    """
+    if fmt not in FORMATS:
+        raise CSDNValidationError(f"不支持的导出格式: {fmt}")
+    path = Path(path)
+    params = {'format': fmt, 'status': status, 'page_size': page_size}
+    checkpoint = _load_checkpoint(path, params, restart)
+    if checkpoint['complete']:
+        logger.info(f"导出已完成，共 {checkpoint['count']} 篇文章: {path}")
+        return checkpoint
+
+    # 丢弃上次中断时未提交的数据
+    with open(path, 'ab') as f:
+        f.truncate(checkpoint['offset'])
+
+    page = checkpoint['page']
+    if page:
+        logger.info(f"从第 {page + 1} 页继续导出，已导出 {checkpoint['count']} 篇文章")
+
+    with open(path, 'ab') as f:
+        while True:
+            page += 1
+            response = await client.get_article_list(page=page, size=page_size, status=status)
+            data = (response or {}).get('data') or {}
+            articles = data.get('list') or []
+            total = data.get('total')
+
+            if articles:
+                f.write(_encode_page(articles, fmt))
+                f.flush()
+                os.fsync(f.fileno())
+                checkpoint.update(page=page, offset=f.tell(), count=checkpoint['count'] + len(articles))
+
+            finished = (not articles or len(articles) < page_size or data.get('noMore')
+                        or (total is not None and checkpoint['count'] >= int(total)))
+            checkpoint['complete'] = bool(finished)
+            write_json_atomic(checkpoint_path(path), checkpoint)
+            logger.info(f"已导出第 {page} 页，累计 {checkpoint['count']} 篇文章")
+            if finished:
+                break
+
+    logger.info(f"导出完成，共 {checkpoint['count']} 篇文章: {path}")
+    return checkpoint
+
+
+def read_export(path: Union[str, Path]) -> Iterator[Dict]:
+    """逐篇读取导出文件，两种格式都返回接口字段名的文章字典"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record.get('article_id'), list):
+                yield record
+                continue
+            for values in zip(*(record[name] for name in COLUMNS)):
+                yield Article(**dict(zip(COLUMNS, values))).to_dict()
@@ -0,0 +1,121 @@
+"""
+用户身份缓存
+缓存当前cookies对应的用户ID，避免每次获取文章列表都访问个人资料页
+"""
+
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+from src.csdn_api.utils import write_json_atomic
+
+# 决定登录身份的cookies
+IDENTITY_COOKIES = ('UserName', 'UserToken', 'UserInfo')
+
+
+class IdentityCache:
+    """用户身份缓存
+
+    缓存与cookies指纹绑定：cookies文件被修改、指纹变化时缓存自动失效。
+    可选地将缓存持久化到cookies文件旁边的 ``<cookies>.identity.json`` 中，
+    供下次启动的进程直接使用。
+    """
+
+    def __init__(self, cookies_file: Path, ttl: float = 3600, persist: bool = False):
+        """初始化身份缓存
+
+        Args:
+            cookies_file: cookies文件路径
+            ttl: 缓存有效期（秒）
+            persist: 是否持久化到磁盘
+        """
+        self.cookies_file = Path(cookies_file)
+        self.cache_file = self.cookies_file.with_name(self.cookies_file.stem + '.identity.json')
+        self.ttl = ttl
+        self.persist = persist
+        self._user_id: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+        self._expires_at = 0.0
+        self._cookies_mtime: Optional[float] = None
+        self._current_fingerprint: Optional[str] = None
+        if persist:
+            self._load()
+
+    def _cookie_fingerprint(self) -> Optional[str]:
+        """计算cookies指纹，cookies文件未修改时复用上次结果"""
+        try:
+            mtime = self.cookies_file.stat().st_mtime
+        except OSError:
+            return None
+        if mtime == self._cookies_mtime:
+            return self._current_fingerprint
+
+        try:
+            with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
+        except Exception as e:
+            logger.error(f"读取cookies失败: {str(e)}")
+            return None
+
+        values = sorted(f"{c['name']}={c['value']}" for c in cookies if c.get('name') in IDENTITY_COOKIES)
+        self._cookies_mtime = mtime
+        self._current_fingerprint = hashlib.sha1('\n'.join(values).encode('utf-8')).hexdigest()
+        return self._current_fingerprint
+
+    def get(self) -> Optional[str]:
+        """获取缓存的用户ID
+
+        Returns:
+            Optional[str]: 缓存有效时返回用户ID，否则返回None
+        """
+        if self._user_id is None:
+            return None
+        if time.time() >= self._expires_at or self._cookie_fingerprint() != self._fingerprint:
+            self.invalidate()
+            return None
+        return self._user_id
+
+    def set(self, user_id: str):
+        """缓存用户ID"""
+        self._user_id = user_id
+        self._fingerprint = self._cookie_fingerprint()
+        self._expires_at = time.time() + self.ttl
+        if self.persist:
+            self._save()
+
+    def invalidate(self):
+        """使缓存失效，cookies变更或认证失败时调用"""
+        self._user_id = None
+        self._fingerprint = None
+        self._expires_at = 0.0
+        if self.persist and self.cache_file.exists():
+            try:
+                self.cache_file.unlink()
+            except OSError as e:
+                logger.error(f"删除身份缓存失败: {str(e)}")
+
+    def _load(self):
+        """从磁盘加载缓存"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._user_id = data['user_id']
+            self._fingerprint = data['fingerprint']
+            self._expires_at = data['expires_at']
+        except Exception as e:
+            logger.error(f"加载身份缓存失败: {str(e)}")
+
+    def _save(self):
+        """写入磁盘缓存，通过临时文件原子替换，写入中断时不会留下损坏的缓存"""
+        try:
+            write_json_atomic(self.cache_file, {
+                'user_id': self._user_id,
+                'fingerprint': self._fingerprint,
+                'expires_at': self._expires_at
+            })
+        except Exception as e:
+            logger.error(f"保存身份缓存失败: {str(e)}")
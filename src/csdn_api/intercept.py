@@ -0,0 +1,114 @@
+"""
+请求拦截策略
+在客户端页面上中止图片、字体、媒体以及统计和广告脚本等与接口数据无关的请求
+
+默认使用请求拦截逐个判断，但启用请求拦截会同时禁用页面的HTTP缓存。
+需要保留持久化缓存时改用 ``Network.setBlockedURLs`` 按URL通配符屏蔽，缓存保持可用。
+"""
+
+import re
+import asyncio
+from typing import Iterable, List, Optional, Pattern, Union
+from loguru import logger
+
+# 默认中止的资源类型
+DEFAULT_BLOCKED_TYPES = ('image', 'font', 'media')
+
+# 默认中止的统计和广告主机
+DEFAULT_BLOCKED_HOSTS = (
+    'hm.baidu.com',
+    'pos.baidu.com',
+    'cpro.baidustatic.com',
+    'dup.baidustatic.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'doubleclick.net',
+    'cnzz.com',
+    'kunpeng-sc.csdnimg.cn',
+    'event.csdn.net',
+    'g.csdn.net',
+)
+
+# 不使用请求拦截时，按扩展名屏蔽各资源类型
+TYPE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mp3', 'ogg', 'm4a', 'wav'),
+}
+
+
+def _compile(patterns: Iterable[Union[str, Pattern]]) -> Optional[Pattern]:
+    """把多个正则合并为一个预编译正则"""
+    sources = [p.pattern if hasattr(p, 'pattern') else p for p in patterns]
+    if not sources:
+        return None
+    return re.compile('|'.join(f'(?:{source})' for source in sources))
+
+
+class RequestPolicy:
+    """请求拦截策略
+
+    按资源类型和主机决定是否中止请求，允许列表中的URL始终放行。
+    """
+
+    def __init__(self,
+                 block_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+                 block_hosts: Iterable[str] = DEFAULT_BLOCKED_HOSTS,
+                 allow: Iterable[Union[str, Pattern]] = ()):
+        """初始化拦截策略
+
+        Args:
+            block_types: 要中止的资源类型，取值同 ``request.resourceType``
+            block_hosts: 要中止的主机，同时匹配其子域名
+            allow: 始终放行的URL正则
+        """
+        self.block_types = frozenset(block_types)
+        self.block_hosts = tuple(block_hosts)
+        hosts = [r'https?://([^/]*\.)?' + re.escape(host) + r'(?=[:/]|$)' for host in block_hosts]
+        self._blocked_hosts = _compile(hosts)
+        self._allow = _compile(allow)
+
+    def should_block(self, request) -> bool:
+        """判断请求是否应被中止"""
+        url = request.url
+        if self._allow is not None and self._allow.search(url):
+            return False
+        if request.resourceType in self.block_types:
+            return True
+        return self._blocked_hosts is not None and self._blocked_hosts.match(url) is not None
+
+    def url_patterns(self) -> List[str]:
+        """与策略等价的URL通配符，资源类型按扩展名近似"""
+        patterns = []
+        for host in self.block_hosts:
+            patterns.extend((f'*://{host}/*', f'*://*.{host}/*'))
+        for block_type in sorted(self.block_types):
+            for extension in TYPE_EXTENSIONS.get(block_type, ()):
+                patterns.extend((f'*.{extension}', f'*.{extension}?*'))
+        return patterns
+
+    async def install(self, page, keep_cache: bool = False):
+        """在页面上启用拦截策略
+
+        Args:
+            page: 页面
+            keep_cache: 是否保留HTTP缓存。为True时不启用请求拦截，改为按 :meth:`url_patterns`
+                屏蔽请求，资源类型按扩展名判断，允许列表不生效
+        """
+        if keep_cache:
+            await page._client.send('Network.setBlockedURLs', {'urls': self.url_patterns()})
+            return
+        # 请求拦截会使pyppeteer禁用页面缓存
+        await page.setRequestInterception(True)
+        page.on('request', lambda request: asyncio.ensure_future(self._handle(request)))
+
+    async def _handle(self, request):
+        try:
+            if self.should_block(request):
+                await request.abort()
+            else:
+                await request.continue_()
+        except Exception as e:
+            # 页面导航或关闭后请求可能已失效
+            logger.debug(f"处理拦截请求失败: {str(e)}")
@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import Dict, List
 from pyppeteer import launch
 from loguru import logger
+from src.csdn_api.cassette import CassetteRecorder, record_response
+from src.csdn_api.utils import write_json_atomic
+from src.csdn_api.session import LOGIN_COOKIES, login_state
 
 # 定义关键域名列表
 IMPORTANT_DOMAINS = [
@@ -20,11 +23,18 @@ IMPORTANT_DOMAINS = [
     'api.csdn.net'
 ]
 
+# 登录后页面会请求的用户信息接口
+PERSONAL_INFO_URL = 'https://bizapi.csdn.net/community-personal/v1/get-personal-info'
+
 class CSDNLoginAnalyzer:
-    def __init__(self):
+    def __init__(self, cassette: str = 'login_requests.cassette.jsonl', check_interval: float = 5.0):
         self.requests_log: List[Dict] = []
         self.cookies_file = Path("cookies.json")
         self.requests_file = Path("login_requests.json")
+        # 关键请求及其响应在捕获时立即写入磁带，中途退出也不会丢失
+        self.recorder = CassetteRecorder(cassette) if cassette else None
+        # 没有浏览器事件时读取cookies兜底的间隔（秒），只读取不导航
+        self.check_interval = check_interval
         
     async def save_request(self, request):
         """保存请求信息，仅保存关键请求"""
@@ -62,6 +72,18 @@ class CSDNLoginAnalyzer:
         except Exception as e:
             logger.error(f"保存请求时出错: {str(e)}")
     
+    async def save_response(self, response):
+        """把关键请求的响应写入磁带"""
+        try:
+            request = response.request
+            if not any(domain in request.url for domain in IMPORTANT_DOMAINS):
+                return
+            if request.resourceType in ['image', 'stylesheet', 'font', 'media']:
+                return
+            await record_response(self.recorder, response)
+        except Exception as e:
+            logger.error(f"录制响应时出错: {str(e)}")
+    
     async def check_login_status(self, page) -> bool:
         """检查是否已登录"""
         try:
@@ -109,14 +131,83 @@ class CSDNLoginAnalyzer:
             logger.error(f"检查登录状态时出错: {str(e)}")
             return False
     
+    async def has_login_cookies(self, page) -> bool:
+        """当前会话中是否已有全部登录cookie，只读取cookies，不导航页面
+
+        与 :func:`login_state` 的判断一致，只出现部分登录cookie时视为登录尚未完成。
+        """
+        cookies = await page.cookies('https://passport.csdn.net/', 'https://www.csdn.net/')
+        return login_state(cookies)['logged_in']
+    
+    async def wait_for_login(self, page, timeout: float = 600) -> bool:
+        """等待扫码登录完成
+        
+        由浏览器事件触发检查：响应中设置了 UserName/UserToken cookie、
+        主页面离开 passport.csdn.net、或页面请求了用户信息接口。
+        确认cookies中已有全部登录cookie后立即返回，不刷新用户正在扫码的页面。
+        事件之外每隔 ``check_interval`` 秒读取一次cookies兜底。
+        
+        Args:
+            page: 打开了登录页的页面
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            bool: 是否在超时前完成登录
+        """
+        loop = asyncio.get_event_loop()
+        done = loop.create_future()
+        
+        async def confirm(reason):
+            if done.done():
+                return
+            try:
+                if await self.has_login_cookies(page) and not done.done():
+                    done.set_result(reason)
+            except Exception as e:
+                logger.debug(f"读取cookies失败: {str(e)}")
+        
+        def on_response(response):
+            if done.done():
+                return
+            if response.url.startswith(PERSONAL_INFO_URL):
+                asyncio.ensure_future(confirm("页面请求了用户信息接口"))
+                return
+            set_cookie = response.headers.get('set-cookie', '')
+            if any(f"{name}=" in set_cookie for name in LOGIN_COOKIES):
+                asyncio.ensure_future(confirm("响应设置了登录cookie"))
+        
+        def on_navigated(frame):
+            if frame is page.mainFrame and 'passport.csdn.net' not in frame.url:
+                asyncio.ensure_future(confirm(f"页面跳转到 {frame.url}"))
+        
+        page.on('response', on_response)
+        page.on('framenavigated', on_navigated)
+        try:
+            deadline = loop.time() + timeout
+            await confirm("已有登录cookie")
+            while not done.done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(asyncio.shield(done), min(remaining, self.check_interval))
+                except asyncio.TimeoutError:
+                    await confirm("定期检查cookies")
+            logger.info(f"检测到登录完成: {done.result()}")
+            return True
+        finally:
+            page.remove_listener('response', on_response)
+            page.remove_listener('framenavigated', on_navigated)
+            if not done.done():
+                done.cancel()
+    
     async def save_cookies(self, page):
         """保存cookies到文件"""
         try:
             cookies = await page.cookies()
-            # 保存所有cookies，不过滤
+            # 保存所有cookies，不过滤；先写临时文件再替换，不会留下写了一半的文件
             if cookies:
-                with open(self.cookies_file, 'w', encoding='utf-8') as f:
-                    json.dump(cookies, f, ensure_ascii=False, indent=2)
+                write_json_atomic(self.cookies_file, cookies)
                 logger.info(f"Cookies已保存到: {self.cookies_file} (共 {len(cookies)} 个)")
             else:
                 logger.warning("没有找到任何cookies！")
@@ -138,6 +229,8 @@ class CSDNLoginAnalyzer:
             
             # 监听所有网络请求
             page.on('request', lambda req: asyncio.ensure_future(self.save_request(req)))
+            if self.recorder is not None:
+                page.on('response', lambda res: asyncio.ensure_future(self.save_response(res)))
             
             # 直接访问登录页面
             logger.info("正在打开登录页面...")
@@ -150,19 +243,14 @@ class CSDNLoginAnalyzer:
             logger.info("3. 如果页面刷新太快，请重新运行脚本")
             logger.info("4. 您有充足的时间完成登录，请不要着急\n")
             
-            # 等待登录成功，增加检查间隔时间
-            login_success = False
-            max_attempts = 60  # 最多等待10分钟
-            for _ in range(max_attempts):
-                if await self.check_login_status(page):
-                    login_success = True
-                    break
-                logger.info("等待登录完成...")
-                await asyncio.sleep(10)  # 每10秒检查一次
-            
-            if not login_success:
+            # 由浏览器事件检测登录完成，最多等待10分钟
+            logger.info("等待登录完成...")
+            if not await self.wait_for_login(page, timeout=600):
                 logger.error("登录等待超时，请重新运行脚本")
                 return
+            
+            # 登录完成后立即保存cookies
+            await self.save_cookies(page)
                     
             # 访问用户中心
             logger.info("登录成功！正在访问用户中心...")
@@ -198,6 +286,9 @@ class CSDNLoginAnalyzer:
             logger.error(f"分析过程出错: {str(e)}")
         finally:
             await browser.close()
+            if self.recorder is not None:
+                self.recorder.close()
+                logger.info(f"已录制 {self.recorder.count} 次请求到: {self.recorder.path}")
 
 def main():
     """主函数"""
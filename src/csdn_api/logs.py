@@ -0,0 +1,95 @@
+"""
+日志工具
+接口响应等较大的数据只在对应级别的日志真正输出时才格式化，并截断到配置的长度
+"""
+
+import sys
+import json
+from typing import Any
+from loguru import logger
+from src.csdn_api.config import get_log_settings
+
+# 单条日志中数据的最大字符数
+PAYLOAD_CHARS = 500
+
+# 列表只保留的前几项
+PAYLOAD_ITEMS = 3
+
+# 单个字符串字段的最大字符数
+PAYLOAD_STRING = 80
+
+# 输出响应数据的日志级别
+PAYLOAD_LEVEL = 'DEBUG'
+
+
+def _sample(value: Any, depth: int = 0) -> Any:
+    """缩减数据：长列表只保留前几项，嵌套的长字符串截断，嵌套过深的部分省略"""
+    if isinstance(value, dict):
+        if depth >= 4:
+            return f'{{...{len(value)} keys}}'
+        return {key: _sample(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_sample(item, depth + 1) for item in value[:PAYLOAD_ITEMS]]
+        if len(value) > PAYLOAD_ITEMS:
+            items.append(f'...+{len(value) - PAYLOAD_ITEMS} items')
+        return items
+    if isinstance(value, str) and depth and len(value) > PAYLOAD_STRING:
+        return value[:PAYLOAD_STRING] + f'...+{len(value) - PAYLOAD_STRING} chars'
+    return value
+
+
+class Payload:
+    """延迟格式化的日志数据
+
+    只在日志被输出、调用 ``str()`` 时才缩减并序列化数据，
+    日志级别低于输出级别时 loguru 不会格式化消息，因此几乎没有开销。
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        if isinstance(self.value, str):
+            text = self.value
+        else:
+            try:
+                text = json.dumps(_sample(self.value), ensure_ascii=False, default=str)
+            except (TypeError, ValueError):
+                text = repr(self.value)
+        if len(text) > PAYLOAD_CHARS:
+            text = text[:PAYLOAD_CHARS] + f'...(共 {len(text)} 字符)'
+        return text
+
+
+def log_payload(message: str, value: Any, level: str = None):
+    """记录一条带数据的日志，数据延迟格式化并截断
+
+    Args:
+        message: 日志消息
+        value: 响应等数据
+        level: 日志级别，默认使用配置的 ``log_payload_level``
+    """
+    logger.opt(depth=1).log(level or PAYLOAD_LEVEL, message + ": {}", Payload(value))
+
+
+def configure_logging(level: str = None, payload_chars: int = None, payload_level: str = None,
+                      default_level: str = 'INFO'):
+    """按参数或配置文件设置日志输出
+
+    未指定的参数依次从环境变量 ``CSDN_LOG_LEVEL``、config.json 的 ``log_level``、
+    ``log_payload_chars``、``log_payload_level`` 读取。会移除 loguru 已有的输出，改为输出到标准错误。
+
+    Args:
+        level: 输出到标准错误的最低日志级别
+        payload_chars: 单条日志中数据的最大字符数
+        payload_level: 输出响应数据的日志级别
+        default_level: 参数和配置都没有指定日志级别时使用的级别
+    """
+    global PAYLOAD_CHARS, PAYLOAD_LEVEL
+    settings = get_log_settings()
+    PAYLOAD_CHARS = int(payload_chars or settings['payload_chars'] or PAYLOAD_CHARS)
+    PAYLOAD_LEVEL = (payload_level or settings['payload_level'] or PAYLOAD_LEVEL).upper()
+    logger.remove()
+    logger.add(sys.stderr, level=(level or settings['level'] or default_level).upper())
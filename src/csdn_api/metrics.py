@@ -0,0 +1,190 @@
+"""
+客户端指标
+记录每个接口的调用结果、总耗时和各阶段耗时，支持自定义钩子，
+并可导出为 Prometheus 文本格式或 JSON 快照
+"""
+
+import time
+import asyncio
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+from loguru import logger
+from src.csdn_api.exceptions import CSDNTimeoutError
+
+# 直方图的桶上界（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SUCCESS = 'success'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class Histogram:
+    """固定桶的延迟直方图"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """返回 (桶上界, 累计数量) 列表，最后一个桶为 +Inf"""
+        result, total = [], 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            total += count
+            result.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return result
+
+    def to_dict(self) -> Dict:
+        return {'buckets': dict(self.cumulative()), 'sum': self.sum, 'count': self.count}
+
+
+class Metrics:
+    """客户端指标
+
+    - 每个接口按结果（success、timeout、error）计数
+    - 每个接口的总耗时直方图
+    - 每个接口各阶段（launch、lease、rate_limit、http、navigate、capture 等）的耗时直方图
+
+    通过 :meth:`add_hook` 注册的钩子会在每次记录时收到一个事件字典，
+    可用于转发到其他监控系统。
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.calls: Dict[Tuple[str, str], int] = {}
+        self.call_durations: Dict[str, Histogram] = {}
+        self.phase_durations: Dict[Tuple[str, str], Histogram] = {}
+        self._hooks: List[Callable[[Dict], None]] = []
+
+    def add_hook(self, hook: Callable[[Dict], None]):
+        """注册钩子
+
+        Args:
+            hook: 接收事件字典的函数，事件格式为
+                ``{'type': 'span', 'endpoint': ..., 'phase': ..., 'duration': ...}`` 或
+                ``{'type': 'call', 'endpoint': ..., 'outcome': ..., 'duration': ...}``
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict], None]):
+        """移除钩子"""
+        self._hooks.remove(hook)
+
+    def _emit(self, event: Dict):
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                logger.error(f"指标钩子执行失败: {str(e)}")
+
+    def observe(self, endpoint: str, phase: str, duration: float):
+        """记录一个阶段的耗时"""
+        key = (endpoint, phase)
+        histogram = self.phase_durations.get(key)
+        if histogram is None:
+            histogram = self.phase_durations[key] = Histogram(self.buckets)
+        histogram.observe(duration)
+        if self._hooks:
+            self._emit({'type': 'span', 'endpoint': endpoint, 'phase': phase, 'duration': duration})
+
+    def record_call(self, endpoint: str, outcome: str, duration: float):
+        """记录一次接口调用的结果和总耗时"""
+        key = (endpoint, outcome)
+        self.calls[key] = self.calls.get(key, 0) + 1
+        histogram = self.call_durations.get(endpoint)
+        if histogram is None:
+            histogram = self.call_durations[endpoint] = Histogram(self.buckets)
+        histogram.observe(duration)
+        if self._hooks:
+            self._emit({'type': 'call', 'endpoint': endpoint, 'outcome': outcome, 'duration': duration})
+
+    @contextmanager
+    def span(self, endpoint: str, phase: str):
+        """记录代码块耗时的上下文管理器，无论是否出错都会记录"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, phase, time.perf_counter() - start)
+
+    @contextmanager
+    def call(self, endpoint: str):
+        """记录一次接口调用，根据是否抛出异常及异常类型判断结果"""
+        start = time.perf_counter()
+        outcome = ERROR
+        try:
+            yield
+            outcome = SUCCESS
+        except (CSDNTimeoutError, asyncio.TimeoutError):
+            outcome = TIMEOUT
+            raise
+        finally:
+            self.record_call(endpoint, outcome, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict:
+        """导出可直接序列化为JSON的快照"""
+        endpoints: Dict[str, Dict] = {}
+        for (endpoint, outcome), count in self.calls.items():
+            endpoints.setdefault(endpoint, {'calls': {}, 'duration': None, 'phases': {}})
+            endpoints[endpoint]['calls'][outcome] = count
+        for endpoint, histogram in self.call_durations.items():
+            endpoints.setdefault(endpoint, {'calls': {}, 'duration': None, 'phases': {}})
+            endpoints[endpoint]['duration'] = histogram.to_dict()
+        for (endpoint, phase), histogram in self.phase_durations.items():
+            endpoints.setdefault(endpoint, {'calls': {}, 'duration': None, 'phases': {}})
+            endpoints[endpoint]['phases'][phase] = histogram.to_dict()
+        return {'endpoints': endpoints}
+
+    def to_prometheus(self, prefix: str = 'csdn_client') -> str:
+        """导出为 Prometheus 文本格式"""
+        lines = [f'# TYPE {prefix}_calls_total counter']
+        for (endpoint, outcome), count in sorted(self.calls.items()):
+            lines.append(f'{prefix}_calls_total{{endpoint="{endpoint}",outcome="{outcome}"}} {count}')
+
+        lines.append(f'# TYPE {prefix}_call_duration_seconds histogram')
+        for endpoint, histogram in sorted(self.call_durations.items()):
+            lines.extend(_histogram_lines(f'{prefix}_call_duration_seconds',
+                                          f'endpoint="{endpoint}"', histogram))
+
+        lines.append(f'# TYPE {prefix}_phase_duration_seconds histogram')
+        for (endpoint, phase), histogram in sorted(self.phase_durations.items()):
+            lines.extend(_histogram_lines(f'{prefix}_phase_duration_seconds',
+                                          f'endpoint="{endpoint}",phase="{phase}"', histogram))
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+             for bound, count in histogram.cumulative()]
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+def instrument(endpoint: str) -> Callable:
+    """
+    记录客户端方法调用结果和耗时的装饰器
+
+    被装饰方法所属对象需要有 ``metrics`` 属性。
+
+    Args:
+        endpoint: 接口名
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            with self.metrics.call(endpoint):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
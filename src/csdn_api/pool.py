@@ -0,0 +1,129 @@
+"""
+浏览器页面池
+管理一个或多个浏览器实例及其页面，按调用租用页面以支持并发请求
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional
+from loguru import logger
+
+
+class PagePool:
+    """浏览器页面池
+
+    启动 ``browsers`` 个浏览器实例，共创建 ``size`` 个页面并轮流分配到各浏览器上。
+    每次API调用通过 :meth:`lease` 独占一个页面，用完后归还，
+    因此同一个客户端上的并发调用互不干扰，最多同时执行 ``size`` 个。
+    """
+
+    def __init__(self,
+                 launcher: Callable[[], Awaitable],
+                 page_setup: Callable = None,
+                 size: int = 1,
+                 browsers: int = 1,
+                 close_browser: Callable = None):
+        """初始化页面池
+
+        Args:
+            launcher: 启动一个浏览器实例的协程函数
+            page_setup: 新页面创建后调用的协程函数，用于加载cookies等初始化工作
+            size: 页面总数，即最大并发调用数
+            browsers: 浏览器实例数量
+            close_browser: 释放浏览器的协程函数，默认关闭浏览器；连接到外部浏览器时可改为断开连接
+        """
+        if size < 1:
+            raise ValueError("size 必须大于等于1")
+        if browsers < 1:
+            raise ValueError("browsers 必须大于等于1")
+        self.launcher = launcher
+        self.page_setup = page_setup
+        self.close_browser = close_browser
+        self.size = size
+        self.browsers: List = []
+        self._browser_count = min(browsers, size)
+        self._pages: Optional[asyncio.Queue] = None
+        self._page_browser = {}
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def started(self) -> bool:
+        """页面池是否已启动"""
+        return self._pages is not None
+
+    async def start(self):
+        """启动浏览器并创建全部页面，并发调用时只会启动一次"""
+        if self.started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            try:
+                for _ in range(self._browser_count):
+                    self.browsers.append(await self.launcher())
+
+                pages = asyncio.Queue()
+                for index in range(self.size):
+                    browser = self.browsers[index % len(self.browsers)]
+                    pages.put_nowait(await self._new_page(browser))
+                self._pages = pages
+                logger.info(f"页面池已启动: {len(self.browsers)} 个浏览器，{self.size} 个页面")
+            except Exception:
+                await self.close()
+                raise
+
+    async def _new_page(self, browser):
+        """在指定浏览器中创建并初始化一个页面"""
+        page = await browser.newPage()
+        self._page_browser[page] = browser
+        if self.page_setup:
+            await self.page_setup(page)
+        return page
+
+    async def _replace(self, page):
+        """替换已关闭或崩溃的页面"""
+        browser = self._page_browser.pop(page, None) or self.browsers[0]
+        logger.warning("页面已失效，正在重新创建...")
+        return await self._new_page(browser)
+
+    @asynccontextmanager
+    async def lease(self):
+        """租用一个页面，退出上下文时自动归还
+
+        Yields:
+            Page: 当前调用独占的页面
+        """
+        if not self.started:
+            await self.start()
+        pages = self._pages
+        page = await pages.get()
+        try:
+            if page.isClosed():
+                page = await self._replace(page)
+            yield page
+        finally:
+            pages.put_nowait(page)
+
+    async def close(self):
+        """关闭页面池创建的全部页面并释放浏览器"""
+        browsers, self.browsers = self.browsers, []
+        pages = list(self._page_browser)
+        self._pages = None
+        self._start_lock = None
+        self._page_browser.clear()
+        for page in pages:
+            try:
+                if not page.isClosed():
+                    await page.close()
+            except Exception as e:
+                logger.debug(f"关闭页面失败: {str(e)}")
+        for browser in browsers:
+            try:
+                if self.close_browser:
+                    await self.close_browser(browser)
+                else:
+                    await browser.close()
+            except Exception as e:
+                logger.error(f"关闭浏览器失败: {str(e)}")
@@ -0,0 +1,188 @@
+"""
+本地搜索索引
+收录 search() 返回的结果，按URL去重并建立倒排索引，离线按关键词检索并用BM25排序
+
+中文没有空格分词，连续的中文字符索引时同时按单字和相邻两字（bigram）切分，
+查询时按相邻两字切分，只有一个汉字时按单字查询；英文和数字按单词切分并转为小写。
+"""
+
+import re
+import json
+import math
+import heapq
+import sqlite3
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 参与索引的字段及其权重
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'description': 1.0,
+    'nickname': 1.0,
+}
+
+# 搜索结果中的高亮标签等HTML
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+|[a-z0-9]+(?:[._+#-][a-z0-9]+)*')
+_CJK_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]')
+
+# BM25参数
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str, unigrams: bool = True) -> List[str]:
+    """切分文本，中文按单字和bigram切分，英文和数字按单词切分
+
+    Args:
+        text: 待切分文本，可以包含HTML标签
+        unigrams: 连续多个汉字是否同时输出单字，查询时为False，只用bigram匹配
+
+    Returns:
+        List[str]: 词列表，保留重复
+    """
+    tokens = []
+    for run in _TOKEN_RE.findall(_TAG_RE.sub(' ', text or '').lower()):
+        if not _CJK_RE.match(run) or len(run) == 1:
+            tokens.append(run)
+            continue
+        if unigrams:
+            tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _doc_key(item: Dict) -> Optional[str]:
+    """搜索结果的去重键"""
+    key = item.get('url') or item.get('id')
+    return str(key) if key else None
+
+
+class SearchIndex:
+    """搜索结果的本地倒排索引
+
+    索引保存在内存中，查询只涉及查询词对应的倒排表。
+    指定 ``path`` 时收录的结果同时写入SQLite，下次创建时重新载入。
+    """
+
+    def __init__(self, path: str = None):
+        """初始化索引
+
+        Args:
+            path: SQLite文件路径，为None时只在内存中保存
+        """
+        self._docs: Dict[str, Dict] = {}
+        self._lengths: Dict[str, float] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._total_length = 0.0
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(str(Path(path)))
+            self._db.execute('CREATE TABLE IF NOT EXISTS documents (key TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            self._db.commit()
+            for key, data in self._db.execute('SELECT key, data FROM documents'):
+                self._index(key, json.loads(data))
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _weights(item: Dict) -> Counter:
+        """结果中各词按字段权重累加的词频"""
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(str(item.get(field) or '')):
+                weights[token] += weight
+        return weights
+
+    def _index(self, key: str, item: Dict):
+        """把一条结果加入内存索引，已存在的同一结果先移除"""
+        if key in self._docs:
+            self._remove(key)
+        weights = self._weights(item)
+        self._docs[key] = item
+        length = sum(weights.values())
+        self._lengths[key] = length
+        self._total_length += length
+        for token, weight in weights.items():
+            self._postings.setdefault(token, {})[key] = weight
+
+    def _remove(self, key: str):
+        item = self._docs.pop(key)
+        self._total_length -= self._lengths.pop(key)
+        for token in self._weights(item):
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+
+    def add(self, items: Iterable[Dict]) -> int:
+        """收录搜索结果，按URL去重，同一URL以最新的结果为准
+
+        Returns:
+            int: 新收录的结果数
+        """
+        added = 0
+        rows = []
+        for item in items:
+            key = _doc_key(item)
+            if key is None:
+                continue
+            if key not in self._docs:
+                added += 1
+            elif self._docs[key] == item:
+                continue
+            self._index(key, item)
+            rows.append((key, json.dumps(item, ensure_ascii=False)))
+        if self._db is not None and rows:
+            self._db.executemany('INSERT OR REPLACE INTO documents (key, data) VALUES (?, ?)', rows)
+            self._db.commit()
+        return added
+
+    def ingest(self, response: Dict) -> int:
+        """收录一次 search() 的响应"""
+        return self.add((response or {}).get('result_vos') or [])
+
+    def query(self, text: str, limit: int = 10, offset: int = 0, match_all: bool = False) -> List[Dict]:
+        """按关键词检索，结果按BM25得分从高到低排列
+
+        Args:
+            text: 查询文本
+            limit: 返回的最大条数
+            offset: 跳过的条数，用于分页
+            match_all: 是否只返回包含全部查询词的结果，为False时包含任一查询词即可
+
+        Returns:
+            List[Dict]: 搜索结果，附加 ``score`` 字段
+        """
+        tokens = set(tokenize(text, unigrams=False))
+        if not tokens or not self._docs:
+            return []
+        if match_all:
+            if any(token not in self._postings for token in tokens):
+                return []
+            candidates = set.intersection(*(set(self._postings[token]) for token in tokens))
+        count = len(self._docs)
+        average = self._total_length / count or 1.0
+        scores: Dict[str, float] = {}
+        for token in tokens:
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                if match_all and key not in candidates:
+                    continue
+                norm = K1 * (1 - B + B * self._lengths[key] / average)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))
+        return [{**self._docs[key], 'score': round(score, 4)}
+                for key, score in ranked[offset:]]
+
+    def close(self):
+        """关闭SQLite连接"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,73 @@
+"""
+登录会话状态
+从cookies判断是否登录及登录cookie的过期时间，不需要导航页面
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+# 登录后才会出现、请求需要认证的接口时必须携带的cookie
+LOGIN_COOKIES = ('UserName', 'UserToken')
+
+
+def _has_expiry(cookie: Dict) -> bool:
+    """cookie是否带有过期时间"""
+    expires = cookie.get('expires')
+    return bool(expires) and expires > 0
+
+
+def merge_cookies(*groups: Iterable[Dict]) -> List[Dict]:
+    """按 (name, domain, path) 合并多组浏览器格式的cookies，后面的值覆盖前面的
+
+    ``.csdn.net`` 与 ``csdn.net`` 视为同一个域名。后面的cookie没有过期时间（``expires`` 缺失或为-1）
+    而前面的有时保留前面的过期时间，不会把已知的过期时间替换为会话cookie。
+    """
+    merged = {}
+    for cookies in groups:
+        for cookie in cookies:
+            domain = cookie.get('domain', '')
+            key = (cookie['name'], '.' + domain.lstrip('.'), cookie.get('path', '/'))
+            previous = merged.get(key, {})
+            cookie = {**previous, **cookie}
+            if not _has_expiry(cookie) and _has_expiry(previous):
+                cookie['expires'] = previous['expires']
+            merged[key] = cookie
+    return list(merged.values())
+
+
+def login_state(cookies: Iterable[Dict], now: float = None) -> Dict:
+    """根据cookies判断登录状态
+
+    所有登录cookie都存在、有值且未过期时视为已登录。
+
+    Args:
+        cookies: 浏览器格式的cookies
+        now: 当前时间戳，默认 ``time.time()``
+
+    Returns:
+        Dict: ``logged_in`` 是否已登录；``expires_at`` 最早过期的登录cookie的过期时间戳，
+        ``expires_in`` 距过期的秒数，登录cookie都是会话cookie或未登录时两者为None
+    """
+    now = time.time() if now is None else now
+    expiry: Dict[str, Optional[float]] = {}
+    for cookie in cookies:
+        name = cookie.get('name')
+        if name not in LOGIN_COOKIES or not cookie.get('value'):
+            continue
+        expires = cookie.get('expires', -1)
+        if expires and 0 < expires <= now:
+            continue
+        expires = expires if expires and expires > 0 else None
+        # 同名cookie出现在多个域名或来源中时取最晚过期的一个，
+        # 不记录过期时间的来源（-1）不覆盖已知的过期时间
+        if name not in expiry or expires is not None and (expiry[name] is None or expires > expiry[name]):
+            expiry[name] = expires
+
+    logged_in = all(name in expiry for name in LOGIN_COOKIES)
+    deadlines = [expires for expires in expiry.values() if expires is not None]
+    expires_at = min(deadlines) if logged_in and deadlines else None
+    return {
+        'logged_in': logged_in,
+        'expires_at': expires_at,
+        'expires_in': expires_at - now if expires_at is not None else None,
+    }
@@ -0,0 +1,218 @@
+"""
+bizapi 请求签名
+bizapi.csdn.net 的接口经过API网关，请求需要携带 ``x-ca-*`` 签名头。
+本模块按网关的规则在Python中生成签名，无需浏览器即可直接请求这些接口；
+也可以校验抓包得到的请求，确认签名规则和密钥正确：
+
+    python -m src.csdn_api.signer api_requests.cassette.jsonl api_requests.json
+
+待签名字符串（各行以换行分隔）：
+    请求方法
+    Accept
+    Content-MD5
+    Content-Type
+    Date
+    x-ca-signature-headers 中列出的请求头，按名称排序，每行 ``名称:值``
+    路径及查询参数，参数按名称排序，``名称=值`` 以 & 连接，值为空时只保留名称
+
+签名为以AppSecret为密钥对待签名字符串做HMAC-SHA256后的Base64编码。
+"""
+
+import sys
+import hmac
+import json
+import time
+import uuid
+import base64
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from loguru import logger
+from src.csdn_api.config import get_bizapi_credentials
+
+# 需要签名的主机
+SIGNED_HOSTS = ('bizapi.csdn.net',)
+
+# 默认参与签名的请求头，与网页发出的请求一致
+SIGNED_HEADERS = ('x-ca-key', 'x-ca-nonce')
+
+DEFAULT_ACCEPT = 'application/json, text/plain, */*'
+
+
+def _canonical_resource(url: str, params: Dict = None) -> str:
+    """路径及按名称排序的查询参数，参数值不做URL编码"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    for key, value in (params or {}).items():
+        query[str(key)] = '' if value is None else str(value)
+    resource = parts.path or '/'
+    if query:
+        resource += '?' + '&'.join(f"{key}={value}" if value != '' else key
+                                   for key, value in sorted(query.items()))
+    return resource
+
+
+def string_to_sign(method: str, url: str, headers: Dict[str, str], params: Dict = None,
+                   signed_headers: Iterable[str] = None) -> str:
+    """构建待签名字符串
+
+    Args:
+        method: 请求方法
+        url: 请求地址，可以带查询参数
+        headers: 请求头，名称不区分大小写
+        params: 额外的查询参数
+        signed_headers: 参与签名的请求头，默认取 ``x-ca-signature-headers`` 中列出的请求头
+
+    Returns:
+        str: 待签名字符串
+    """
+    headers = {name.lower(): value for name, value in headers.items()}
+    if signed_headers is None:
+        signed_headers = [name.strip() for name in headers.get('x-ca-signature-headers', '').split(',')
+                          if name.strip()]
+    lines = [
+        method.upper(),
+        headers.get('accept', ''),
+        headers.get('content-md5', ''),
+        headers.get('content-type', ''),
+        headers.get('date', ''),
+    ]
+    lines.extend(f"{name}:{headers.get(name, '')}" for name in sorted(name.lower() for name in signed_headers))
+    lines.append(_canonical_resource(url, params))
+    return '\n'.join(lines)
+
+
+def sign(secret: str, text: str) -> str:
+    """HMAC-SHA256签名并做Base64编码"""
+    digest = hmac.new(secret.encode('utf-8'), text.encode('utf-8'), hashlib.sha256).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+class BizapiSigner:
+    """生成bizapi请求的 ``x-ca-*`` 签名头"""
+
+    def __init__(self, app_key: str, app_secret: str, signed_headers: Iterable[str] = SIGNED_HEADERS):
+        """初始化签名器
+
+        Args:
+            app_key: AppKey，即请求头中的 ``x-ca-key``
+            app_secret: AppSecret
+            signed_headers: 参与签名的 ``x-ca-*`` 请求头
+        """
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.signed_headers = tuple(name.lower() for name in signed_headers)
+
+    @classmethod
+    def from_config(cls) -> Optional['BizapiSigner']:
+        """按环境变量或config.json中的 ``bizapi_key``、``bizapi_secret`` 创建签名器，未配置时返回None"""
+        app_key, app_secret = get_bizapi_credentials()
+        if not app_key or not app_secret:
+            return None
+        return cls(app_key, app_secret)
+
+    @staticmethod
+    def supports(url: str) -> bool:
+        """地址是否需要签名"""
+        return urlsplit(url).hostname in SIGNED_HOSTS
+
+    def headers(self, method: str, url: str, params: Dict = None, accept: str = DEFAULT_ACCEPT,
+                content_type: str = '', body: bytes = None) -> Dict[str, str]:
+        """生成一次请求的签名头
+
+        Args:
+            method: 请求方法
+            url: 请求地址
+            params: 查询参数
+            accept: 请求实际发送的Accept头
+            content_type: 请求实际发送的Content-Type头
+            body: 请求体，非表单请求体会计算Content-MD5
+
+        Returns:
+            Dict[str, str]: 需要加入请求的请求头，包括 accept
+        """
+        headers = {
+            'accept': accept,
+            'x-ca-key': self.app_key,
+            'x-ca-nonce': str(uuid.uuid4()),
+            'x-ca-timestamp': str(int(time.time() * 1000)),
+            'x-ca-signature-headers': ','.join(self.signed_headers),
+        }
+        if content_type:
+            headers['content-type'] = content_type
+        if body and not content_type.startswith('application/x-www-form-urlencoded'):
+            headers['content-md5'] = base64.b64encode(hashlib.md5(body).digest()).decode('ascii')
+        headers['x-ca-signature'] = sign(
+            self.app_secret, string_to_sign(method, url, headers, params, self.signed_headers))
+        return headers
+
+
+def verify_request(method: str, url: str, headers: Dict[str, str], app_secret: str,
+                   params: Dict = None) -> Tuple[bool, str]:
+    """用AppSecret校验抓包得到的请求的签名
+
+    Returns:
+        Tuple[bool, str]: (签名是否一致, 待签名字符串)
+    """
+    text = string_to_sign(method, url, headers, params)
+    lowered = {name.lower(): value for name, value in headers.items()}
+    return hmac.compare_digest(sign(app_secret, text), lowered.get('x-ca-signature', '')), text
+
+
+def load_captured(path: Path) -> Iterator[Dict]:
+    """读取抓包记录，支持磁带（JSON Lines）和 analyze_request 保存的JSON数组"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        yield from json.loads(text)
+        return
+    for line in text.splitlines():
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                pass
+
+
+def check_captured(paths: List[Path], app_secret: str = None) -> Tuple[int, int]:
+    """校验抓包记录中所有带签名的请求
+
+    Returns:
+        Tuple[int, int]: (签名一致的数量, 校验的数量)
+    """
+    passed = checked = 0
+    for path in paths:
+        for entry in load_captured(path):
+            headers = entry.get('headers') or {}
+            if not any(name.lower() == 'x-ca-signature' for name in headers):
+                continue
+            method = entry.get('method') or 'GET'
+            url = entry['url']
+            if not app_secret:
+                logger.info(f"{method} {url} 待签名字符串:\n{string_to_sign(method, url, headers, entry.get('params'))}")
+                continue
+            checked += 1
+            ok, text = verify_request(method, url, headers, app_secret, entry.get('params'))
+            if ok:
+                passed += 1
+                logger.info(f"签名一致: {method} {url}")
+            else:
+                logger.warning(f"签名不一致: {method} {url}\n待签名字符串:\n{text}")
+    return passed, checked
+
+
+def main():
+    """主函数"""
+    paths = [Path(arg) for arg in sys.argv[1:]] or [Path('api_requests.cassette.jsonl')]
+    _, app_secret = get_bizapi_credentials()
+    if not app_secret:
+        logger.warning("未配置 bizapi_secret（环境变量 CSDN_BIZAPI_SECRET），只输出待签名字符串")
+    passed, checked = check_captured(paths, app_secret)
+    if checked:
+        logger.info(f"共校验 {checked} 个请求，签名一致 {passed} 个")
+    sys.exit(0 if passed == checked else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+文章增量同步
+本地SQLite索引按文章ID记录上次看到的发布时间、标题和各项计数，
+同步时从第一页开始翻页，遇到连续多篇已知且未改动的文章就停止，只返回新增或有变化的文章
+"""
+
+import json
+import time
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+from loguru import logger
+from src.csdn_api.articles import Article
+
+# 判断文章是否有变化时比较的字段
+TRACKED_FIELDS = ('publish_time', 'title', 'view_count', 'comment_count', 'digg_count')
+
+
+class ArticleIndex:
+    """按文章ID索引的本地文章库"""
+
+    def __init__(self, path: str = 'articles.db'):
+        """初始化索引
+
+        Args:
+            path: SQLite文件路径，``:memory:`` 表示只在内存中
+        """
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            'article_id INTEGER PRIMARY KEY, publish_time TEXT NOT NULL, title TEXT NOT NULL, '
+            'view_count INTEGER NOT NULL, comment_count INTEGER NOT NULL, digg_count INTEGER NOT NULL, '
+            'data TEXT NOT NULL, synced_at REAL NOT NULL)'
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def state(self, article_ids: List[int]) -> Dict[int, Tuple]:
+        """批量读取文章上次同步时的字段值
+
+        Returns:
+            Dict[int, Tuple]: 文章ID到 TRACKED_FIELDS 对应值的映射，不在索引中的文章不包含在内
+        """
+        if not article_ids:
+            return {}
+        placeholders = ','.join('?' * len(article_ids))
+        rows = self._db.execute(
+            f'SELECT article_id, {", ".join(TRACKED_FIELDS)} FROM articles '
+            f'WHERE article_id IN ({placeholders})', article_ids)
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def upsert(self, articles: List[Dict]):
+        """写入或更新文章"""
+        now = time.time()
+        rows = []
+        for data in articles:
+            record = Article.from_dict(data)
+            rows.append((record.article_id, *(getattr(record, name) for name in TRACKED_FIELDS),
+                         json.dumps(data, ensure_ascii=False), now))
+        self._db.executemany(
+            f'INSERT OR REPLACE INTO articles (article_id, {", ".join(TRACKED_FIELDS)}, data, synced_at) '
+            f'VALUES ({",".join("?" * (len(TRACKED_FIELDS) + 3))})', rows)
+        self._db.commit()
+
+    def get(self, article_id: int) -> Optional[Dict]:
+        """读取一篇文章上次同步时的完整数据"""
+        row = self._db.execute('SELECT data FROM articles WHERE article_id = ?', (article_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __iter__(self) -> Iterator[Dict]:
+        """按发布时间从新到旧遍历全部文章"""
+        for (data,) in self._db.execute('SELECT data FROM articles ORDER BY publish_time DESC'):
+            yield json.loads(data)
+
+    def close(self):
+        """关闭SQLite连接"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+async def sync_articles(client, index: ArticleIndex, status: str = "all", page_size: int = 20,
+                        stop_after: int = 5, full: bool = False) -> Dict:
+    """增量同步文章到本地索引
+
+    文章列表按发布时间从新到旧排列，新文章总在前面。
+    遇到 ``stop_after`` 篇连续的已知文章且发布时间和标题都没有变化时，
+    说明更早的文章上次已经同步过，处理完当前页后停止翻页。
+    已翻到的页中阅读、评论、点赞数有变化的文章同样视为有变化；
+    更早的页中的计数变化需要定期使用 ``full=True`` 完整同步。
+
+    置顶文章会出现在第一页最前面，``stop_after`` 应大于置顶文章的数量。
+    索引在全部页取完后才写入，同步中途失败时索引不变，再次同步会重新取这些页。
+
+    Args:
+        client: :class:`CSDNClient` 或其他提供 ``get_article_list`` 的客户端
+        index: 本地文章索引
+        status: 文章状态，可选值：all（全部）、published（已发布）、draft（草稿）
+        page_size: 每页数量
+        stop_after: 连续遇到多少篇未改动的已知文章后停止
+        full: 是否翻完全部页
+
+    Returns:
+        Dict: ``{'new': [...], 'changed': [...], 'pages': 页数}``，文章为接口返回的原始字典
+    """
+    new, changed = [], []
+    # 全部页取完后一次写入索引，中途失败时索引保持不变，下次同步不会把未同步完的页误判为已知
+    updates = []
+    page = 0
+    seen = 0
+    unchanged_run = 0
+    while True:
+        page += 1
+        response = await client.get_article_list(page=page, size=page_size, status=status)
+        data = (response or {}).get('data') or {}
+        articles = data.get('list') or []
+        total = data.get('total')
+        seen += len(articles)
+
+        records = [Article.from_dict(article) for article in articles]
+        known = index.state([record.article_id for record in records])
+        reached_known = False
+        for article, record in zip(articles, records):
+            previous = known.get(record.article_id)
+            current = tuple(getattr(record, name) for name in TRACKED_FIELDS)
+            if previous is None:
+                new.append(article)
+                updates.append(article)
+                unchanged_run = 0
+                continue
+            if previous != current:
+                changed.append(article)
+                updates.append(article)
+            # 只有发布时间和标题决定是否停止，计数几乎总在变化
+            if previous[:2] == current[:2]:
+                unchanged_run += 1
+                reached_known = reached_known or unchanged_run >= stop_after
+            else:
+                unchanged_run = 0
+
+        finished = (not articles or len(articles) < page_size or data.get('noMore')
+                    or (total is not None and seen >= int(total)))
+        if finished or (reached_known and not full):
+            break
+
+    index.upsert(updates)
+    logger.info(f"同步完成: 新增 {len(new)} 篇，变化 {len(changed)} 篇，请求 {page} 页")
+    return {'new': new, 'changed': changed, 'pages': page}
@@ -0,0 +1,225 @@
+"""
+CSDN HTTP 直连传输层
+复用浏览器保存的cookies直接请求接口，省去浏览器导航的开销；
+配置了签名器时，需要 ``x-ca-*`` 签名的bizapi接口也可以直接请求
+"""
+
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+from src.csdn_api.exceptions import (
+    CSDNAuthError, CSDNAPIError, CSDNBlockedError, CSDNRateLimitError
+)
+from src.csdn_api.utils import check_rate_limit
+from src.csdn_api.signer import BizapiSigner
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# 表示未登录或登录失效的业务码
+AUTH_FAILURE_CODES = {401, 403, '401', '403', 400101}
+
+
+class HttpTransport:
+    """基于 requests.Session 的直连传输层
+
+    Session 使用连接池并保持长连接，cookies 从浏览器导出的 ``cookies.json`` 中加载。
+    遇到认证失败时抛出 :class:`CSDNAuthError`，遇到验证码等反爬页面时抛出
+    :class:`CSDNBlockedError`，调用方可据此回退到浏览器。
+    """
+
+    # 认证失败或被拦截时客户端是否回退到浏览器
+    browser_fallback = True
+
+    # 请求是否需要经过客户端的限流器
+    rate_limited = True
+
+    def __init__(self, cookies_file: Path, pool_size: int = 10, timeout: float = 10.0,
+                 signer: BizapiSigner = None):
+        """初始化传输层
+
+        Args:
+            cookies_file: cookies文件路径
+            pool_size: 每个主机的最大连接数，同时也是执行请求的线程数
+            timeout: 单次请求超时时间（秒）
+            signer: bizapi签名器，请求需要签名的地址时自动加上签名头
+        """
+        self.cookies_file = Path(cookies_file)
+        self.signer = signer
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+        # 从cookies文件载入时各cookie的状态，导出时据此只导出响应中设置或修改过的cookie
+        self._loaded: Dict[Tuple, Tuple] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """懒加载的HTTP会话"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池的会话并加载cookies"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'accept': 'application/json, text/plain, */*',
+            'user-agent': USER_AGENT,
+        })
+        self._load_cookies(session)
+        return session
+
+    @staticmethod
+    def _cookie_key(cookie) -> Tuple:
+        return cookie.name, cookie.domain, cookie.path
+
+    @staticmethod
+    def _cookie_state(cookie) -> Tuple:
+        return cookie.value, cookie.expires, bool(cookie.secure), cookie.has_nonstandard_attr('HttpOnly')
+
+    def _load_cookies(self, session: requests.Session):
+        """将浏览器格式的cookies写入会话，跳过已过期的cookie"""
+        self._loaded = {}
+        if not self.cookies_file.exists():
+            return
+        try:
+            with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
+        except Exception as e:
+            logger.error(f"加载cookies失败: {str(e)}")
+            return
+
+        now = time.time()
+        for cookie in cookies:
+            expires = cookie.get('expires', -1)
+            if expires and 0 < expires < now:
+                continue
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                expires=int(expires) if expires and expires > 0 else None,
+                secure=bool(cookie.get('secure')),
+                rest={'HttpOnly': None} if cookie.get('httpOnly') else {}
+            )
+        self._loaded = {self._cookie_key(cookie): self._cookie_state(cookie) for cookie in session.cookies}
+
+    def reload_cookies(self):
+        """cookies文件更新后重新加载"""
+        with self._lock:
+            if self._session is not None:
+                self._session.cookies.clear()
+                self._load_cookies(self._session)
+
+    def supports(self, url: str) -> bool:
+        """是否可以直接请求页面接口（用户信息、未读消息）
+
+        bizapi的接口需要签名，配置了签名器时才能直接请求；其他页面接口只能由浏览器发出。
+        """
+        return self.signer is not None and self.signer.supports(url)
+
+    def export_cookies(self) -> List[Dict]:
+        """以浏览器cookies格式导出响应中设置或修改过的cookies
+
+        从cookies文件载入后没有变化的cookie不导出，避免用会话中的副本覆盖文件。
+        响应设置的会话cookie ``expires`` 为-1。
+
+        Returns:
+            List[Dict]: cookies列表，会话尚未创建时为空
+        """
+        with self._lock:
+            if self._session is None:
+                return []
+            return [{
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'expires': cookie.expires if cookie.expires is not None else -1,
+                'secure': bool(cookie.secure),
+                'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+            } for cookie in self._session.cookies
+                if self._loaded.get(self._cookie_key(cookie)) != self._cookie_state(cookie)]
+
+    def _request(self, url: str, params: Dict = None, headers: Dict = None) -> Dict:
+        """在线程中执行的同步请求"""
+        if self.signer is not None and self.signer.supports(url):
+            # 签名覆盖Accept头，必须与实际发送的一致
+            signed = self.signer.headers('GET', url, params, accept=self.session.headers['accept'])
+            headers = {**(headers or {}), **signed}
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        # 网关拒绝签名时在响应头中说明原因
+        gateway_error = response.headers.get('x-ca-error-message')
+        if gateway_error:
+            raise CSDNAuthError(f"签名校验失败: {gateway_error}")
+        if response.status_code in (401, 403):
+            raise CSDNAuthError(f"认证失败: HTTP {response.status_code}")
+        if response.status_code == 429:
+            raise CSDNRateLimitError("请求频率超限")
+
+        try:
+            data = response.json()
+        except ValueError:
+            # 非JSON响应一般是验证码或WAF拦截页面
+            raise CSDNBlockedError(f"响应不是JSON，可能触发了反爬验证: HTTP {response.status_code}")
+
+        if response.status_code >= 400:
+            raise CSDNAPIError(f"请求失败: HTTP {response.status_code}",
+                               status_code=response.status_code, response=response.text)
+
+        if isinstance(data, dict) and data.get('code') in AUTH_FAILURE_CODES:
+            message = data.get('message') or data.get('msg') or ''
+            raise CSDNAuthError(f"认证失败: {message}")
+        check_rate_limit(data)
+        return data
+
+    async def get_json(self, url: str, params: Dict = None, headers: Dict = None) -> Dict:
+        """发送GET请求并返回JSON
+
+        Args:
+            url: 请求地址
+            params: 查询参数
+            headers: 额外的请求头
+
+        Returns:
+            Dict: 响应JSON
+
+        Raises:
+            CSDNAuthError: 认证失败时抛出
+            CSDNBlockedError: 触发反爬验证时抛出
+            CSDNRateLimitError: 请求频率超限时抛出
+            CSDNAPIError: 其他请求失败时抛出
+        """
+        if self._executor is None:
+            # 线程数与连接池大小一致，避免受默认线程池大小限制
+            self._executor = ThreadPoolExecutor(self.pool_size, thread_name_prefix='csdn-http')
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._request, url, params, headers)
+        except requests.RequestException as e:
+            raise CSDNAPIError(f"HTTP请求失败: {str(e)}")
+
+    def close(self):
+        """关闭会话及其连接池"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -2,11 +2,18 @@
 CSDN API 工具函数
 """
 
+import os
+import json
 import time
+import asyncio
+import tempfile
 import functools
-from typing import Callable
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Union
+from urllib.parse import urlparse
 from loguru import logger
 from .exceptions import CSDNRateLimitError
+from .articles import Article
 
 def rate_limit(max_per_second: int = 1) -> Callable:
     """
@@ -45,6 +52,167 @@ def rate_limit(max_per_second: int = 1) -> Callable:
     
     return decorator
 
+def check_rate_limit(response_data) -> None:
+    """
+    检查接口响应是否为频率限制提示
+    
+    Args:
+        response_data: 接口响应JSON
+        
+    Raises:
+        CSDNRateLimitError: 响应提示请求频率太快时抛出
+    """
+    if isinstance(response_data, dict):
+        message = str(response_data.get('message') or response_data.get('msg') or '')
+        if "频率太快" in message:
+            raise CSDNRateLimitError("请求频率超限")
+
+class TokenBucket:
+    """异步令牌桶"""
+    
+    def __init__(self, rate: float, burst: float = None):
+        """
+        Args:
+            rate: 每秒生成的令牌数
+            burst: 桶容量，默认与rate相同（至少为1）
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = None
+        self._lock = None
+        
+    def _refill(self, now: float):
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+    async def acquire(self):
+        """获取一个令牌，令牌不足时只挂起当前协程，按先来后到排队"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_event_loop()
+        async with self._lock:
+            self._refill(loop.time())
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill(loop.time())
+            self.tokens -= 1
+
+class AsyncRateLimiter:
+    """
+    按主机划分的异步限流器
+    
+    每个主机一个令牌桶，由同一客户端的所有页面和并发任务共享。
+    收到频率限制错误时将该主机的速率减半并清空令牌，
+    之后每次成功请求逐步恢复，直到回到配置的速率。
+    """
+    
+    # 各主机默认的每秒请求数
+    DEFAULT_RATES = {
+        'bizapi.csdn.net': 2,
+        'msg.csdn.net': 2,
+        'blog.csdn.net': 5,
+        'so.csdn.net': 5,
+    }
+    
+    def __init__(self, rates: Dict[str, float] = None, default_rate: float = 5,
+                 min_rate: float = 0.2, recovery: float = 1.1):
+        """
+        Args:
+            rates: 各主机的每秒请求数，覆盖默认值
+            default_rate: 未配置主机的每秒请求数
+            min_rate: 退避后的最低速率
+            recovery: 每次成功请求后速率的恢复倍数
+        """
+        self.rates = {**self.DEFAULT_RATES, **(rates or {})}
+        self.default_rate = default_rate
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._buckets: Dict[str, TokenBucket] = {}
+        
+    def bucket(self, host: str) -> TokenBucket:
+        """获取主机对应的令牌桶，host也可以是完整URL"""
+        host = self._hostname(host)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rates.get(host, self.default_rate))
+        return bucket
+        
+    @staticmethod
+    def _hostname(host: str) -> str:
+        return urlparse(host).hostname if '://' in host else host
+        
+    async def acquire(self, host: str):
+        """获取主机的一个请求令牌"""
+        await self.bucket(host).acquire()
+        
+    def penalize(self, host: str):
+        """收到频率限制后降低主机速率"""
+        bucket = self.bucket(host)
+        bucket.rate = max(self.min_rate, bucket.rate / 2)
+        bucket.tokens = 0
+        logger.warning(f"{self._hostname(host)} 触发频率限制，速率降至 {bucket.rate:.2f}/s")
+        
+    def reward(self, host: str):
+        """请求成功后逐步恢复主机速率"""
+        bucket = self.bucket(host)
+        if bucket.rate < bucket.max_rate:
+            bucket.rate = min(bucket.max_rate, bucket.rate * self.recovery)
+            
+    async def call(self, host: str, func: Callable[[], Awaitable], acquire: bool = True):
+        """
+        在限流下执行请求
+        
+        Args:
+            host: 请求的主机
+            func: 发起请求的协程函数
+            acquire: 是否先获取令牌，调用方已自行调用 :meth:`acquire` 时传False
+            
+        Returns:
+            请求结果
+            
+        Raises:
+            CSDNRateLimitError: 请求触发频率限制时抛出
+        """
+        if acquire:
+            await self.acquire(host)
+        try:
+            result = await func()
+            check_rate_limit(result)
+        except CSDNRateLimitError:
+            self.penalize(host)
+            raise
+        self.reward(host)
+        return result
+
+def write_json_atomic(path: Union[str, Path], data: Any):
+    """
+    原子地写入JSON文件
+    
+    先写入同目录下的临时文件再替换目标文件，其他进程不会读到写了一半的内容，
+    写入失败时原文件保持不变。
+    
+    Args:
+        path: 目标文件路径
+        data: 可序列化为JSON的数据
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def extract_csrf_token(html_content: str) -> str:
     """
     从HTML内容中提取CSRF token
@@ -58,15 +226,15 @@ def extract_csrf_token(html_content: str) -> str:
     # TODO: 实现CSRF token提取逻辑
     raise NotImplementedError("CSRF token提取功能尚未实现")
 
-def parse_article_data(response_data: dict) -> dict:
+def parse_article_data(response_data: dict) -> List[Article]:
     """
     解析文章数据
     
     Args:
-        response_data: API响应数据
+        response_data: 文章列表接口的响应数据
         
     Returns:
-        dict: 解析后的文章数据
+        List[Article]: 文章记录列表，响应中没有文章时为空列表
     """
-    # TODO: 实现文章数据解析逻辑
-    raise NotImplementedError("文章数据解析功能尚未实现") 
\ No newline at end of file
+    data = (response_data or {}).get('data') or {}
+    return [Article.from_dict(item) for item in data.get('list') or []] 
\ No newline at end of file
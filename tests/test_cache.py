@@ -0,0 +1,100 @@
+import asyncio
+
+from src.csdn_api.cache import FRESH, STALE, ResponseCache, make_key
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def age(cache, key, seconds):
+    """把条目的写入时间提前 seconds 秒"""
+    value, stored_at = cache._memory[key]
+    cache._memory[key] = (value, stored_at - seconds)
+    if cache._db is not None:
+        cache._db.execute('UPDATE responses SET stored_at = stored_at - ? WHERE key = ?', (seconds, key))
+        cache._db.commit()
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'page': len(calls)}
+
+    async def fetch_all():
+        return await asyncio.gather(*[cache.fetch('search', {'q': 'python'}, loader) for _ in range(5)])
+
+    assert run(fetch_all()) == [{'page': 1}] * 5
+    assert len(calls) == 1
+    assert cache.stats['misses'] == 5
+    cache.close()
+
+
+def test_stale_entry_is_served_while_refreshing():
+    cache = ResponseCache(ttl={'search': 10}, stale={'search': 100})
+    key = make_key('search', {'q': 'python'})
+    cache.set(key, 'old')
+    age(cache, key, 20)
+    assert cache.get('search', key) == ('old', STALE)
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def loader():
+            started.set()
+            await release.wait()
+            return 'new'
+
+        # 过期后先返回旧数据，同时只启动一次后台刷新
+        assert await cache.fetch('search', {'q': 'python'}, loader) == 'old'
+        assert await cache.fetch('search', {'q': 'python'}, loader) == 'old'
+        assert len(cache._refreshing) == 1
+        await started.wait()
+        release.set()
+        await cache._refreshing[key]
+        return await cache.fetch('search', {'q': 'python'}, loader)
+
+    assert run(scenario()) == 'new'
+    assert cache.get('search', key) == ('new', FRESH)
+    assert cache.stats['stale_hits'] == 2
+    cache.close()
+
+
+def test_purge_by_endpoint(tmp_path):
+    # user 是 user_info 的前缀，两者的键范围不能重叠
+    cache = ResponseCache(str(tmp_path / 'cache.db'), ttl={'user': 10, 'user_info': 1000},
+                          stale={'user': 0, 'user_info': 0})
+    user = make_key('user', {'id': 1})
+    user_info = make_key('user_info', {'id': 1})
+    unknown = make_key('removed', {'id': 1})
+    for key in (user, user_info, unknown):
+        cache.set(key, key)
+        age(cache, key, 100)
+    cache.set(make_key('user', {'id': 2}), 'fresh')
+
+    assert cache.purge() == 2
+    rows = {key for (key,) in cache._db.execute('SELECT key FROM responses')}
+    assert rows == {user_info, make_key('user', {'id': 2})}
+    cache.close()
+
+
+def test_purge_keeps_newest_rows(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_rows=2)
+    keys = [make_key('search', {'p': page}) for page in range(4)]
+    for offset, key in enumerate(keys):
+        cache.set(key, key)
+        age(cache, key, 10 - offset)
+
+    assert cache.purge() == 2
+    rows = {key for (key,) in cache._db.execute('SELECT key FROM responses')}
+    assert rows == set(keys[2:])
+    cache.close()
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.csdn_api.cassette import CassetteRecorder, ReplayTransport, load_cassette
+from src.csdn_api.client import BUSINESS_LIST_URL, UNREAD_MESSAGE_URL, USER_INFO_URL, CSDNClient
+from src.csdn_api.exceptions import CSDNAPIError, CSDNAuthError
+
+USER_INFO = {'code': 200, 'data': {'basic': {'id': 'alice', 'nickName': 'Alice'}}}
+
+
+def article_params(page):
+    return {'page': page, 'size': 2, 'businessType': 'blog', 'orderby': '', 'noMore': 'false',
+            'year': '', 'month': '', 'username': 'alice'}
+
+
+def article_page(page):
+    return {'code': 200, 'data': {'list': [{'articleId': page * 10}], 'total': 3}}
+
+
+def record_cassette(path):
+    with CassetteRecorder(path, append=False) as recorder:
+        recorder.record(USER_INFO_URL, USER_INFO)
+        recorder.record(BUSINESS_LIST_URL, article_page(1), params=article_params(1))
+        recorder.record(BUSINESS_LIST_URL + '?page=9', None, status=401)
+        recorder.record(BUSINESS_LIST_URL, article_page(2), params=article_params(1), method='POST')
+    return path
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_recorded_entries(tmp_path):
+    entries = list(load_cassette(record_cassette(tmp_path / 'session.jsonl')))
+    assert len(entries) == 4
+    assert entries[1]['params']['page'] == '1'
+    assert entries[2]['url'] == BUSINESS_LIST_URL and entries[2]['params'] == {'page': '9'}
+
+
+def test_strict_matching(tmp_path):
+    transport = ReplayTransport(record_cassette(tmp_path / 'session.jsonl'))
+    # 参数值不区分数字和字符串，POST记录不参与回放
+    assert run(transport.get_json(BUSINESS_LIST_URL, params=article_params('1'))) == article_page(1)
+    with pytest.raises(CSDNAPIError):
+        run(transport.get_json(BUSINESS_LIST_URL, params=article_params(2)))
+    with pytest.raises(CSDNAuthError):
+        run(transport.get_json(BUSINESS_LIST_URL, params={'page': 9}))
+    assert transport.supports(USER_INFO_URL)
+    assert not transport.supports(UNREAD_MESSAGE_URL)
+
+    loose = ReplayTransport(tmp_path / 'session.jsonl', strict=False)
+    with pytest.raises(CSDNAuthError):
+        run(loose.get_json(BUSINESS_LIST_URL, params=article_params(2)))
+
+
+def test_repeated_entries_replay_in_order():
+    transport = ReplayTransport([
+        {'url': USER_INFO_URL, 'response': {'code': 200, 'n': 1}},
+        {'url': USER_INFO_URL, 'response': {'code': 200, 'n': 2}},
+    ])
+    assert [run(transport.get_json(USER_INFO_URL))['n'] for _ in range(3)] == [1, 2, 2]
+
+
+def test_client_replays_without_browser(tmp_path):
+    client = CSDNClient(cookies_file=str(tmp_path / 'cookies.json'),
+                        transport=ReplayTransport(record_cassette(tmp_path / 'session.jsonl')))
+
+    async def no_browser():
+        raise AssertionError("回放时不应启动浏览器")
+
+    client.init = no_browser
+
+    async def scenario():
+        try:
+            assert await client.get_user_info() == USER_INFO
+            assert await client.get_article_list(page=1, size=2) == article_page(1)
+            with pytest.raises(CSDNAPIError):
+                await client.get_article_list(page=2, size=2)
+            # 磁带中没有未读消息的记录
+            with pytest.raises(CSDNAPIError):
+                await client.get_unread_message_count()
+        finally:
+            await client.close()
+
+    run(scenario())
+    assert not client.pool.started
+
+
+def test_missing_user_info_does_not_start_browser(tmp_path):
+    client = CSDNClient(cookies_file=str(tmp_path / 'cookies.json'), transport=ReplayTransport([
+        {'url': BUSINESS_LIST_URL, 'params': article_params(1), 'response': article_page(1)},
+    ]))
+
+    async def no_browser():
+        raise AssertionError("回放时不应启动浏览器")
+
+    client.init = no_browser
+
+    async def scenario():
+        try:
+            # 获取用户ID需要用户信息接口
+            with pytest.raises(CSDNAPIError, match="不允许回退到浏览器"):
+                await client.get_article_list(page=1, size=2)
+        finally:
+            await client.close()
+
+    run(scenario())
@@ -0,0 +1,145 @@
+import asyncio
+import gc
+
+import pytest
+
+from src.csdn_api.cassette import ReplayTransport
+from src.csdn_api.client import CSDNClient
+from src.csdn_api.exceptions import CSDNAPIError, CSDNAuthError
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def make_client(tmp_path):
+    return CSDNClient(cookies_file=str(tmp_path / 'cookies.json'), transport=ReplayTransport([]))
+
+
+def article_pages(total, page_size, fail_after=None):
+    """按页返回 total 篇文章的假 get_article_list，记录请求过的页
+
+    ``fail_after`` 之后的页一直等待，被取消时像浏览器请求一样转为 CSDNAPIError
+    """
+    requested = []
+
+    async def get_article_list(page=1, size=20, status='all'):
+        requested.append(page)
+        await asyncio.sleep(0)
+        if fail_after is not None and page > fail_after:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                raise CSDNAPIError("请求被取消")
+        start = (page - 1) * size
+        return {'data': {'list': [{'articleId': number} for number in range(start, min(start + size, total))],
+                         'total': total}}
+
+    return get_article_list, requested
+
+
+@pytest.mark.parametrize('total, pages', [(1, [1]), (3, [1, 2]), (9, [1, 2, 3, 4, 5])])
+def test_iter_articles_requests_only_existing_pages(tmp_path, total, pages):
+    client = make_client(tmp_path)
+    client.get_article_list, requested = article_pages(total, 2)
+
+    async def collect():
+        try:
+            return [article async for article in client.iter_articles(page_size=2, prefetch=2)]
+        finally:
+            await client.close()
+
+    assert [article['articleId'] for article in run(collect())] == list(range(total))
+    assert sorted(requested) == pages
+
+
+def test_iter_articles_early_exit_retrieves_prefetch_errors(tmp_path):
+    client = make_client(tmp_path)
+    client.get_article_list, requested = article_pages(10, 2, fail_after=1)
+
+    async def first():
+        articles = client.iter_articles(page_size=2, prefetch=2)
+        try:
+            article = await articles.__anext__()
+            # 让预取的请求开始执行后再提前结束
+            await asyncio.sleep(0.01)
+            return article
+        finally:
+            await articles.aclose()
+            # 让被取消的预取请求结束
+            await asyncio.sleep(0.01)
+            await client.close()
+
+    messages = []
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda loop, context: messages.append(context['message']))
+    try:
+        assert loop.run_until_complete(first())['articleId'] == 0
+    finally:
+        loop.close()
+    gc.collect()
+    assert requested == [1, 2, 3, 4]
+    assert not [message for message in messages if 'never retrieved' in message]
+
+
+def fake_search(fail=None, fatal=None, pages=3):
+    """每个关键词有 pages 页结果的假 search，fail 关键词的请求失败，fatal 关键词认证失败"""
+    requested = []
+
+    async def search(keyword, page=1, scope='all'):
+        requested.append((keyword, page))
+        await asyncio.sleep(0.001)
+        if keyword == fatal:
+            raise CSDNAuthError("认证失败")
+        if keyword == fail and page == 1:
+            raise CSDNAPIError("搜索失败")
+        if page > pages:
+            return {'result_vos': []}
+        return {'result_vos': [{'url': f'https://blog.csdn.net/{keyword}/{page}'}]}
+
+    return search, requested
+
+
+def test_search_many_continues_after_page_error(tmp_path):
+    client = make_client(tmp_path)
+    client.search, _ = fake_search(fail='rust', pages=2)
+    errors = []
+
+    async def collect():
+        try:
+            return [(keyword, page) async for keyword, page, _ in client.search_many(
+                ['python', 'rust', 'go'], pages=4, concurrency=2,
+                on_error=lambda keyword, page, error: errors.append((keyword, page, type(error))))]
+        finally:
+            await client.close()
+
+    results = run(collect())
+    assert sorted(results) == [('go', 1), ('go', 2), ('python', 1), ('python', 2), ('rust', 2)]
+    assert errors == [('rust', 1, CSDNAPIError)]
+
+
+def test_search_many_stops_on_auth_error(tmp_path):
+    client = make_client(tmp_path)
+    client.search, requested = fake_search(fatal='rust', pages=5)
+    errors = []
+
+    async def collect():
+        results = []
+        try:
+            async for keyword, page, _ in client.search_many(
+                    ['python', 'rust', 'go'], pages=5, concurrency=1,
+                    on_error=lambda *args: errors.append(args)):
+                results.append((keyword, page))
+        finally:
+            await client.close()
+        return results
+
+    with pytest.raises(CSDNAuthError):
+        run(collect())
+    # 按页码优先分配，认证失败后不再发起新请求
+    assert requested == [('python', 1), ('rust', 1)]
+    assert errors == []
@@ -0,0 +1,60 @@
+import json
+import time
+
+from src.csdn_api.session import merge_cookies
+from src.csdn_api.transport import HttpTransport
+
+EXPIRES = int(time.time()) + 7 * 24 * 3600
+
+COOKIES = [
+    {'name': 'UserName', 'value': 'alice', 'domain': '.csdn.net', 'path': '/',
+     'expires': EXPIRES, 'secure': True, 'httpOnly': False},
+    {'name': 'UserToken', 'value': 'token', 'domain': '.csdn.net', 'path': '/',
+     'expires': EXPIRES, 'secure': True, 'httpOnly': True},
+    {'name': 'dc_session_id', 'value': 'session', 'domain': '.csdn.net', 'path': '/',
+     'expires': -1, 'secure': False, 'httpOnly': False},
+]
+
+
+def make_transport(tmp_path):
+    cookies_file = tmp_path / 'cookies.json'
+    cookies_file.write_text(json.dumps(COOKIES), encoding='utf-8')
+    transport = HttpTransport(cookies_file)
+    transport.session
+    return transport
+
+
+def test_load_export_merge_keeps_cookies(tmp_path):
+    transport = make_transport(tmp_path)
+    try:
+        assert transport.export_cookies() == []
+        assert merge_cookies(COOKIES, transport.export_cookies()) == COOKIES
+    finally:
+        transport.close()
+
+
+def test_loaded_cookies_keep_attributes(tmp_path):
+    transport = make_transport(tmp_path)
+    try:
+        token = next(cookie for cookie in transport.session.cookies if cookie.name == 'UserToken')
+        assert token.expires == EXPIRES
+        assert token.secure
+        assert token.has_nonstandard_attr('HttpOnly')
+    finally:
+        transport.close()
+
+
+def test_refreshed_cookie_keeps_known_expiry(tmp_path):
+    transport = make_transport(tmp_path)
+    try:
+        # 响应以会话cookie的形式刷新了登录cookie
+        transport.session.cookies.set('UserToken', 'refreshed', domain='.csdn.net', path='/')
+        exported = transport.export_cookies()
+        assert [cookie['name'] for cookie in exported] == ['UserToken']
+
+        merged = {cookie['name']: cookie for cookie in merge_cookies(COOKIES, exported)}
+        assert merged['UserToken']['value'] == 'refreshed'
+        assert merged['UserToken']['expires'] == EXPIRES
+        assert merged['UserName'] == COOKIES[0]
+    finally:
+        transport.close()
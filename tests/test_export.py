@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+from src.csdn_api.exceptions import CSDNAPIError, CSDNValidationError
+from src.csdn_api.export import checkpoint_path, export_articles, read_export
+
+ARTICLES = [{'articleId': number, 'title': f'文章{number}', 'viewCount': number} for number in range(9)]
+
+
+class FakeClient:
+    """按页返回 ARTICLES，可以让指定页失败"""
+
+    def __init__(self, fail_page: int = None):
+        self.fail_page = fail_page
+        self.pages = []
+
+    async def get_article_list(self, page: int = 1, size: int = 20, status: str = 'all'):
+        self.pages.append(page)
+        if page == self.fail_page:
+            raise CSDNAPIError("API调用失败")
+        return {'data': {'list': ARTICLES[(page - 1) * size:page * size], 'total': len(ARTICLES)}}
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize('fmt', ['jsonl', 'columns'])
+def test_resume_after_failure(tmp_path, fmt):
+    path = tmp_path / 'articles.gz'
+    with pytest.raises(CSDNAPIError):
+        run(export_articles(FakeClient(fail_page=3), path, fmt=fmt, page_size=2))
+    checkpoint = json.loads(checkpoint_path(path).read_text(encoding='utf-8'))
+    assert (checkpoint['page'], checkpoint['count'], checkpoint['complete']) == (2, 4, False)
+
+    # 中断时写了一半、没有提交到检查点的数据
+    with open(path, 'ab') as f:
+        f.write(b'\x1f\x8b partial')
+
+    client = FakeClient()
+    result = run(export_articles(client, path, fmt=fmt, page_size=2))
+    assert client.pages == [3, 4, 5]
+    assert (result['count'], result['complete']) == (len(ARTICLES), True)
+    assert [article['articleId'] for article in read_export(path)] == [article['articleId'] for article in ARTICLES]
+
+    # 已完成的导出不再请求
+    client = FakeClient()
+    run(export_articles(client, path, fmt=fmt, page_size=2))
+    assert client.pages == []
+
+
+def test_refuses_file_shorter_than_checkpoint(tmp_path):
+    path = tmp_path / 'articles.gz'
+    with pytest.raises(CSDNAPIError):
+        run(export_articles(FakeClient(fail_page=3), path, page_size=2))
+    size = path.stat().st_size
+    with open(path, 'r+b') as f:
+        f.truncate(size - 1)
+
+    client = FakeClient()
+    with pytest.raises(CSDNValidationError):
+        run(export_articles(client, path, page_size=2))
+    assert client.pages == []
+    assert path.stat().st_size == size - 1
+
+    path.unlink()
+    with pytest.raises(CSDNValidationError):
+        run(export_articles(client, path, page_size=2))
+    assert not path.exists()
+
+
+def test_refuses_changed_parameters(tmp_path):
+    path = tmp_path / 'articles.gz'
+    with pytest.raises(CSDNAPIError):
+        run(export_articles(FakeClient(fail_page=2), path, page_size=2))
+    with pytest.raises(CSDNValidationError):
+        run(export_articles(FakeClient(), path, page_size=3))
+
+    result = run(export_articles(FakeClient(), path, page_size=3, restart=True))
+    assert result['count'] == len(ARTICLES)
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.csdn_api.cassette import ReplayTransport
+from src.csdn_api.client import CSDNClient
+from src.csdn_api.search_index import SearchIndex, tokenize
+
+RESULTS = [
+    {'url': 'https://blog.csdn.net/a/1', 'title': 'Python爬虫入门', 'description': '用requests抓取网页'},
+    {'url': 'https://blog.csdn.net/a/2', 'title': 'Python数据分析', 'description': 'pandas入门教程'},
+    {'url': 'https://blog.csdn.net/a/3', 'title': 'Rust并发编程', 'description': '<em>tokio</em>异步运行时'},
+]
+
+
+def test_tokenize():
+    assert tokenize('Python爬虫入门') == ['python', '爬', '虫', '入', '门', '爬虫', '虫入', '入门']
+    assert tokenize('Python爬虫入门', unigrams=False) == ['python', '爬虫', '虫入', '入门']
+    assert tokenize('学 C++ <em>node.js</em>', unigrams=False) == ['学', 'c', 'node.js']
+
+
+def test_bm25_ranking():
+    index = SearchIndex()
+    index.add(RESULTS)
+    hits = index.query('python 入门')
+    # 标题中的词权重更高，同时包含两个词的结果排在前面
+    assert [hit['url'] for hit in hits] == ['https://blog.csdn.net/a/1', 'https://blog.csdn.net/a/2']
+    assert hits[0]['score'] > hits[1]['score'] > 0
+    assert index.query('python 入门', limit=1, offset=1)[0]['url'] == hits[1]['url']
+
+
+def test_single_cjk_character_matches():
+    index = SearchIndex()
+    index.add(RESULTS)
+    assert [hit['url'] for hit in index.query('虫')] == ['https://blog.csdn.net/a/1']
+
+
+def test_match_all():
+    index = SearchIndex()
+    index.add(RESULTS)
+    assert len(index.query('python 爬虫')) == 2
+    assert [hit['url'] for hit in index.query('python 爬虫', match_all=True)] == ['https://blog.csdn.net/a/1']
+    assert index.query('python tokio', match_all=True) == []
+
+
+def test_persisted_index_reloads(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    assert index.add(RESULTS + RESULTS[:1]) == 3
+    index.close()
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    assert len(index) == 3
+    assert index.query('tokio')[0]['url'] == 'https://blog.csdn.net/a/3'
+    index.close()
+
+
+@pytest.mark.parametrize('keyword, source', [('python 爬虫', 'local'), ('python tokio', None)])
+def test_local_first_requires_every_keyword(tmp_path, keyword, source):
+    index = SearchIndex()
+    index.add(RESULTS)
+    client = CSDNClient(cookies_file=str(tmp_path / 'cookies.json'), transport=ReplayTransport([]),
+                        search_index=index)
+    online = []
+
+    async def fake_search(keyword, page, scope):
+        online.append(keyword)
+        return {'code': 200, 'result_vos': []}
+
+    client._search = fake_search
+
+    async def search():
+        try:
+            return await client.search(keyword, local_first=True)
+        finally:
+            await client.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        response = loop.run_until_complete(search())
+    finally:
+        loop.close()
+    assert response.get('source') == source
+    assert online == ([] if source else [keyword])
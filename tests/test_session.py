@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.csdn_api.cassette import ReplayTransport
+from src.csdn_api.client import UNREAD_MESSAGE_URL, USER_INFO_URL, CSDNClient
+from src.csdn_api.session import login_state
+from src.csdn_api.transport import HttpTransport
+
+EXPIRES = int(time.time()) + 7 * 24 * 3600
+
+COOKIES = [
+    {'name': 'UserName', 'value': 'alice', 'domain': '.csdn.net', 'path': '/',
+     'expires': EXPIRES, 'secure': True, 'httpOnly': False},
+    {'name': 'UserToken', 'value': 'token', 'domain': '.csdn.net', 'path': '/',
+     'expires': EXPIRES, 'secure': True, 'httpOnly': True},
+]
+
+
+def test_login_state_prefers_known_expiry():
+    now = time.time()
+    state = login_state([
+        {'name': 'UserName', 'value': 'alice', 'domain': '.csdn.net', 'expires': EXPIRES},
+        {'name': 'UserName', 'value': 'alice', 'domain': 'blog.csdn.net', 'expires': -1},
+        {'name': 'UserToken', 'value': 'token', 'domain': '.csdn.net', 'expires': -1},
+        {'name': 'UserToken', 'value': 'token', 'domain': 'blog.csdn.net', 'expires': EXPIRES},
+    ], now)
+    assert state['logged_in']
+    assert state['expires_at'] == EXPIRES
+
+
+def test_check_session_keeps_expiry_with_http_session(tmp_path):
+    cookies_file = tmp_path / 'cookies.json'
+    cookies_file.write_text(json.dumps(COOKIES), encoding='utf-8')
+
+    async def check():
+        transport = HttpTransport(cookies_file)
+        client = CSDNClient(cookies_file=str(cookies_file), transport=transport)
+        try:
+            before = await client.check_session()
+            transport.session
+            after = await client.check_session()
+            # 响应以会话cookie的形式刷新了登录cookie
+            transport.session.cookies.set('UserToken', 'refreshed', domain='.csdn.net', path='/')
+            refreshed = await client.check_session()
+            return before, after, refreshed
+        finally:
+            await client.close()
+
+    for state in asyncio.new_event_loop().run_until_complete(check()):
+        assert state['logged_in']
+        assert state['expires_at'] == EXPIRES
+
+
+def verify_session(tmp_path, transport, use_http=True):
+    """在不允许启动浏览器的客户端上执行 check_session(verify=True)"""
+    cookies_file = tmp_path / 'cookies.json'
+    cookies_file.write_text(json.dumps(COOKIES), encoding='utf-8')
+    client = CSDNClient(cookies_file=str(cookies_file), transport=transport, use_http=use_http)
+
+    async def no_browser():
+        raise AssertionError("确认会话时不应打开浏览器页面")
+
+    client.init = no_browser
+
+    async def check():
+        try:
+            return await client.check_session(verify=True)
+        finally:
+            await client.close()
+
+    return asyncio.new_event_loop().run_until_complete(check())
+
+
+@pytest.mark.parametrize('entry, verified', [
+    ({'url': USER_INFO_URL, 'response': {'code': 200, 'data': {'basic': {'id': 'alice'}}}}, True),
+    ({'url': USER_INFO_URL, 'status': 401, 'response': None}, False),
+    # 不能直连用户信息接口时改为请求未读消息接口
+    ({'url': UNREAD_MESSAGE_URL, 'response': {'code': 200, 'data': {}}}, True),
+    ({'url': UNREAD_MESSAGE_URL, 'status': 401, 'response': None}, False),
+])
+def test_verify_uses_one_http_request(tmp_path, entry, verified):
+    state = verify_session(tmp_path, ReplayTransport([entry]))
+    assert state['verified'] is verified
+    assert state['logged_in'] is verified
+
+
+def test_verify_skipped_without_transport(tmp_path):
+    state = verify_session(tmp_path, None, use_http=False)
+    assert state['verified'] is None
+    assert state['logged_in']
@@ -0,0 +1,84 @@
+import json
+import uuid
+
+from src.csdn_api import signer
+from src.csdn_api.signer import BizapiSigner, check_captured, sign, string_to_sign, verify_request
+
+APP_KEY = '203803574'
+APP_SECRET = 'secret-for-tests'
+NONCE = '1f8e2c4a-0b7d-4c61-9a3e-5d2f7b9c1e00'
+TIMESTAMP = 1700000000.0
+URL = 'https://bizapi.csdn.net/community-personal/v1/get-personal-info?b=2&a='
+
+HEADERS = {
+    'Accept': 'application/json, text/plain, */*',
+    'x-ca-key': APP_KEY,
+    'x-ca-nonce': NONCE,
+    'x-ca-timestamp': '1700000000000',
+    'x-ca-signature-headers': 'x-ca-key,x-ca-nonce',
+}
+
+EXPECTED_STRING = (
+    'GET\n'
+    'application/json, text/plain, */*\n'
+    '\n'
+    '\n'
+    '\n'
+    'x-ca-key:203803574\n'
+    'x-ca-nonce:1f8e2c4a-0b7d-4c61-9a3e-5d2f7b9c1e00\n'
+    '/community-personal/v1/get-personal-info?a&b=2&c=1'
+)
+
+# 用 openssl dgst -sha256 -hmac secret-for-tests -binary | base64 计算
+EXPECTED_SIGNATURE = 'imqrOw909nq9Bjv6d1jSJEp+6cF5lETlbN9hLHr1S1Q='
+
+
+def captured(**changes):
+    """一条抓包得到的签名请求"""
+    entry = {'method': 'GET', 'url': URL, 'params': {'c': '1'},
+             'headers': {**HEADERS, 'x-ca-signature': EXPECTED_SIGNATURE}}
+    entry.update(changes)
+    return entry
+
+
+def test_string_to_sign():
+    assert string_to_sign('GET', URL, HEADERS, {'c': 1}) == EXPECTED_STRING
+
+
+def test_sign():
+    assert sign(APP_SECRET, EXPECTED_STRING) == EXPECTED_SIGNATURE
+
+
+def test_signer_headers(monkeypatch):
+    monkeypatch.setattr(signer.uuid, 'uuid4', lambda: uuid.UUID(NONCE))
+    monkeypatch.setattr(signer.time, 'time', lambda: TIMESTAMP)
+    headers = BizapiSigner(APP_KEY, APP_SECRET).headers('GET', URL, {'c': 1})
+    assert headers['x-ca-nonce'] == NONCE
+    assert headers['x-ca-timestamp'] == '1700000000000'
+    assert headers['x-ca-signature'] == EXPECTED_SIGNATURE
+
+
+def test_verify_request():
+    entry = captured()
+    ok, text = verify_request(entry['method'], entry['url'], entry['headers'], APP_SECRET, entry['params'])
+    assert ok and text == EXPECTED_STRING
+
+
+def test_verify_request_rejects_changes():
+    entry = captured(headers={**captured()['headers'], 'x-ca-nonce': str(uuid.uuid4())})
+    assert not verify_request('GET', entry['url'], entry['headers'], APP_SECRET, entry['params'])[0]
+
+    entry = captured(url=URL.replace('get-personal-info', 'get-other-info'))
+    assert not verify_request('GET', entry['url'], entry['headers'], APP_SECRET, entry['params'])[0]
+
+
+def test_check_captured(tmp_path):
+    cassette = tmp_path / 'captured.jsonl'
+    entries = [
+        captured(),
+        captured(url=URL.replace('get-personal-info', 'get-other-info')),
+        # 没有签名的请求不参与校验
+        {'method': 'GET', 'url': 'https://blog.csdn.net/community/home-api/v1/get-business-list', 'headers': {}},
+    ]
+    cassette.write_text('\n'.join(json.dumps(entry) for entry in entries) + '\n', encoding='utf-8')
+    assert check_captured([cassette], APP_SECRET) == (1, 2)
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from src.csdn_api.exceptions import CSDNAPIError
+from src.csdn_api.sync import ArticleIndex, sync_articles
+
+ARTICLES = [
+    {'articleId': 100 - number, 'title': f'文章{number}', 'publishTime': f'2024-01-{20 - number:02d} 10:00:00',
+     'viewCount': 10, 'commentCount': 0, 'diggCount': 0}
+    for number in range(7)
+]
+
+
+class FakeClient:
+    """按页返回 ARTICLES，可以让指定页失败"""
+
+    def __init__(self, fail_page: int = None):
+        self.fail_page = fail_page
+        self.pages = []
+
+    async def get_article_list(self, page: int = 1, size: int = 20, status: str = 'all'):
+        self.pages.append(page)
+        if page == self.fail_page:
+            raise CSDNAPIError("API调用失败")
+        articles = ARTICLES[(page - 1) * size:page * size]
+        return {'data': {'list': articles, 'total': len(ARTICLES)}}
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+def test_failed_sync_leaves_index_unchanged():
+    index = ArticleIndex(':memory:')
+    try:
+        with pytest.raises(CSDNAPIError):
+            run(sync_articles(FakeClient(fail_page=2), index, page_size=2, stop_after=2))
+        assert len(index) == 0
+
+        result = run(sync_articles(FakeClient(), index, page_size=2, stop_after=2))
+        assert [article['articleId'] for article in result['new']] == [article['articleId'] for article in ARTICLES]
+        assert len(index) == len(ARTICLES)
+    finally:
+        index.close()
+
+
+def test_incremental_sync_stops_at_known_articles():
+    index = ArticleIndex(':memory:')
+    try:
+        run(sync_articles(FakeClient(), index, page_size=2, stop_after=2))
+        client = FakeClient()
+        result = run(sync_articles(client, index, page_size=2, stop_after=2))
+        assert result['new'] == [] and result['changed'] == []
+        assert client.pages == [1]
+    finally:
+        index.close()